@@ -1,7 +1,33 @@
 from src.app.user.model.user import User
+from src.app.user.repository.cache import UserLoginCache
 from src.app.user.repository.user import UserRepository
 from src.app.user.service.user import UserService
-from src.core.dependencies.auth import jwt_service
+from src.core.config import settings
+from src.core.dependencies.auth import jwt_service, password_hasher
+from src.core.dependencies.db import Postgres, Redis
+from src.core.dependencies.startup import on_startup
+from src.core.utils.bloom import RedisBloomFilter
 
-user_repository = UserRepository(User)
-user_service = UserService(user_repository, jwt_service)
+login_cache = (
+    UserLoginCache(Redis, ttl=settings.user_cache.ttl, negative_ttl=settings.user_cache.negative_ttl)
+    if settings.user_cache.enabled
+    else None
+)
+unique_filter = (
+    RedisBloomFilter(
+        Redis, "user:unique", capacity=settings.user_filter.capacity, error_rate=settings.user_filter.error_rate
+    )
+    if settings.user_filter.enabled
+    else None
+)
+user_repository = UserRepository(User, login_cache, unique_filter)
+user_service = UserService(user_repository, jwt_service, password_hasher)
+
+
+if unique_filter is not None:
+
+    @on_startup
+    async def rebuild_unique_filter():
+        # 큰 테이블이어도 rebuild 가 끝날 때까지는 이전 filter 를 사용하며, 여러 worker 중 하나만 만듭니다.
+        async with Postgres.session_factory() as session:
+            await user_repository.rebuild_unique_filter(session)
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, Response, status
 
 from src.app.user.api.dependencies import user_service
 from src.app.user.schema.login import LoginResponse
-from src.app.user.schema.register import RegisterResponse
+from src.app.user.schema.register import HandleAvailableResponse, RegisterResponse
+from src.core.dependencies.db import postgres_session
 from src.core.dependencies.oauth import oauth_password_schema
 
 # oauth_password_schema는 차후 유저 인증용
@@ -30,3 +31,9 @@ async def register(
     access, refresh = tokens
     response.set_cookie(key="refresh", value=refresh, httponly=True)
     return RegisterResponse(access=access)
+
+
+@router.get("/handle-available", status_code=status.HTTP_200_OK)
+async def handle_available(handle: str, session: postgres_session) -> HandleAvailableResponse:
+    available = await user_service.is_handle_available(handle, session)
+    return HandleAvailableResponse(handle=handle, available=available)
@@ -0,0 +1,136 @@
+import json
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import NamedTuple
+
+from redis.exceptions import RedisError, WatchError
+from webtool.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = "null"
+
+
+class LoginCredential(NamedTuple):
+    id: int
+    password: str
+
+
+class UserLoginCache:
+    """
+    로그인에 필요한 유저 projection (id, password) 을 email/handle 로 읽어 두는 read-through 캐시
+    없는 유저도 짧은 TTL 로 캐시하여 반복되는 실패 로그인이 DB 까지 가지 않게 하며,
+    유저 id 별로 캐시한 key 를 기록해 두었다가 유저가 수정/삭제되면 함께 지웁니다.
+    지울 때마다 version 을 올리고, DB 를 읽는 동안 version 이 바뀌었으면 읽은 값을 캐시하지 않아
+    commit 전에 읽은 이전 값이 지운 뒤에 다시 캐시되지 않게 합니다.
+    Redis 에 문제가 있으면 캐시 없이 DB 를 읽습니다.
+    """
+
+    def __init__(self, cache: RedisCache, ttl: int = 300, negative_ttl: int = 30, key_prefix: str = "user:login:"):
+        """
+        Args:
+            cache (RedisCache):
+            ttl (int): 유저 projection 의 TTL (초)
+            negative_ttl (int): 없는 유저의 TTL (초)
+            key_prefix (str): 캐시 key 의 prefix
+        """
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.key_prefix = key_prefix
+        self.version_key = f"{key_prefix}version"
+
+    def get_key(self, field: str, value: str) -> str:
+        return f"{self.key_prefix}{field}:{value}"
+
+    def get_index_key(self, id: int | str) -> str:
+        return f"{self.key_prefix}id:{id}"
+
+    async def get(
+        self, field: str, value: str, loader: Callable[[], Awaitable[LoginCredential | None]]
+    ) -> LoginCredential | None:
+        """
+        Parameters:
+            field: 조회한 컬럼 (email, handle)
+            value: 조회한 값
+            loader: 캐시에 없을 때 DB 에서 projection 을 읽는 함수
+
+        Returns:
+            LoginCredential 또는 유저가 없으면 None
+        """
+        key = self.get_key(field, value)
+        try:
+            cached, version = await self.cache.cache.mget(key, self.version_key)
+        except RedisError:
+            logger.warning("Failed to read login cache %s", key, exc_info=True)
+            return await loader()
+
+        if cached is not None:
+            credential = json.loads(cached)
+            return None if credential is None else LoginCredential(*credential)
+
+        user = await loader()
+        try:
+            await self._set(key, user, version)
+        except WatchError:
+            pass
+        except RedisError:
+            logger.warning("Failed to write login cache %s", key, exc_info=True)
+        return user
+
+    async def _set(self, key: str, user: LoginCredential | None, version: bytes | str | None) -> None:
+        async with self.cache.cache.pipeline(transaction=True) as pipe:
+            # loader 가 읽는 동안 invalidate/forget 이 있었으면 읽은 값이 이미 틀렸을 수 있으므로 캐시하지 않습니다.
+            await pipe.watch(self.version_key)
+            if await pipe.get(self.version_key) != version:
+                return
+
+            pipe.multi()
+            if user is None:
+                pipe.set(key, _MISSING, ex=self.negative_ttl)
+            else:
+                index_key = self.get_index_key(user.id)
+                pipe.set(key, json.dumps(user), ex=self.ttl)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, self.ttl)
+            await pipe.execute()
+
+    async def forget(self, values: Iterable[tuple[str, str]]) -> None:
+        """
+        email/handle 의 캐시를 지웁니다. 새 유저가 생기거나 email/handle 이 바뀌어 없는 유저 캐시가 틀리게 된 경우 사용합니다.
+
+        Parameters:
+            values: (field, value) 목록
+        """
+        keys = [self.get_key(field, value) for field, value in values]
+        if not keys:
+            return
+
+        try:
+            async with self.cache.cache.pipeline(transaction=True) as pipe:
+                pipe.incr(self.version_key)
+                pipe.unlink(*keys)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to invalidate login cache", exc_info=True)
+
+    async def invalidate(self, ids: Iterable[int | str]) -> None:
+        """
+        유저 id 로 캐시한 key 를 모두 지웁니다.
+        """
+        index_keys = [self.get_index_key(id) for id in ids]
+        if not index_keys:
+            return
+
+        try:
+            # version 을 먼저 올려야, index 를 읽은 뒤에 이전 값을 캐시하는 요청이 생기지 않습니다.
+            async with self.cache.cache.pipeline(transaction=False) as pipe:
+                pipe.incr(self.version_key)
+                for index_key in index_keys:
+                    pipe.smembers(index_key)
+                _, *members = await pipe.execute()
+
+            keys = [key for keys in members for key in keys]
+            await self.cache.cache.unlink(*keys, *index_keys)
+        except RedisError:
+            logger.warning("Failed to invalidate login cache", exc_info=True)
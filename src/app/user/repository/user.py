@@ -1,13 +1,25 @@
-from sqlalchemy import or_
+import datetime
+from collections.abc import AsyncIterator, Iterable, Sequence
+from functools import partial
+from typing import Any
+
+import polars as pl
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession as Session
 
 from src.app.user.model.user import User
+from src.app.user.repository.cache import LoginCredential, UserLoginCache
 from src.core.models.repository import (
     BaseCreateRepository,
     BaseDeleteRepository,
     BaseReadRepository,
     BaseUpdateRepository,
 )
+from src.core.utils.bloom import RedisBloomFilter
+
+_UNIQUE_FIELDS = ("email", "handle")
+# rebuild 를 시작하기 전에 시작되어 늦게 commit 된 트랜잭션의 row 를 다시 읽기 위한 여유
+_CATCH_UP_MARGIN = datetime.timedelta(minutes=5)
 
 
 class UserCreateRepository(BaseCreateRepository[User]):
@@ -15,6 +27,55 @@ class UserCreateRepository(BaseCreateRepository[User]):
 
 
 class UserReadRepository(BaseReadRepository[User]):
+    login_cache: UserLoginCache | None = None
+    unique_filter: RedisBloomFilter | None = None
+
+    async def may_exist(self, **fields: str) -> bool:
+        """
+        email/handle 중 하나라도 이미 있을 수 있으면 True. False 이면 DB 를 읽지 않아도 확실히 없습니다.
+        """
+        if self.unique_filter is None:
+            return True
+        return await self.unique_filter.might_contain(*(f"{field}:{value}" for field, value in fields.items()))
+
+    async def filter_matches(self, **fields: str) -> bool:
+        """
+        만들어진 unique_filter 가 email/handle 중 하나라도 있을 수 있다고 한 경우에만 True.
+        filter 가 없거나 아직 만들어지지 않았거나 Redis 에 문제가 있으면 False 입니다.
+        """
+        if self.unique_filter is None:
+            return False
+        return await self.unique_filter.contains(*(f"{field}:{value}" for field, value in fields.items())) is True
+
+    async def handle_exists(self, session: Session, handle: str) -> bool:
+        if not await self.may_exist(handle=handle):
+            return False
+
+        result = await self.get(session, columns=["id"], filters=[self.model.handle == handle])
+        return result.first() is not None
+
+    async def _iter_unique_values(self, session: Session, since: datetime.datetime | None = None) -> AsyncIterator[str]:
+        filters = [] if since is None else [or_(self.model.created_at >= since, self.model.updated_at >= since)]
+        async for row in self.stream(session, filters=filters, columns=list(_UNIQUE_FIELDS)):
+            for field in _UNIQUE_FIELDS:
+                yield f"{field}:{getattr(row, field)}"
+
+    async def rebuild_unique_filter(self, session: Session) -> int | None:
+        """
+        users 테이블의 email/handle 로 unique_filter 를 다시 만듭니다.
+        다 읽은 뒤 시작 시각 이후에 생성/수정된 row 를 한 번 더 읽어, 읽는 동안 commit 된 값이 빠지지 않게 합니다.
+
+        Returns:
+            넣은 값의 개수. 다른 worker 가 만들고 있으면 None
+        """
+        if self.unique_filter is None:
+            return 0
+
+        since = await session.scalar(select(func.now())) - _CATCH_UP_MARGIN
+        return await self.unique_filter.rebuild(
+            self._iter_unique_values(session), lambda: self._iter_unique_values(session, since)
+        )
+
     async def get_unique_fields(self, session: Session, email: str, handle: str):
         result = await self.get(
             session,
@@ -28,13 +89,21 @@ class UserReadRepository(BaseReadRepository[User]):
         )
         return result
 
-    async def get_user_by_email(self, session: Session, email: str):
-        result = await self.get(session, columns=["id", "password"], filters=[self.model.email == email])
-        return result
+    async def _get_login_credential(self, session: Session, field: str, value: str) -> LoginCredential | None:
+        async def loader():
+            result = await self.get(session, columns=["id", "password"], filters=[getattr(self.model, field) == value])
+            row = result.first()
+            return None if row is None else LoginCredential(row.id, row.password)
 
-    async def get_user_by_handle(self, session: Session, handle: str):
-        result = await self.get(session, columns=["id", "password"], filters=[self.model.handle == handle])
-        return result
+        if self.login_cache is None:
+            return await loader()
+        return await self.login_cache.get(field, value, loader)
+
+    async def get_user_by_email(self, session: Session, email: str) -> LoginCredential | None:
+        return await self._get_login_credential(session, "email", email)
+
+    async def get_user_by_handle(self, session: Session, handle: str) -> LoginCredential | None:
+        return await self._get_login_credential(session, "handle", handle)
 
 
 class UserUpdateRepository(BaseUpdateRepository[User]):
@@ -46,4 +115,83 @@ class UserDeleteRepository(BaseDeleteRepository[User]):
 
 
 class UserRepository(UserCreateRepository, UserReadRepository, UserUpdateRepository, UserDeleteRepository):
-    pass
+    def __init__(
+        self,
+        model: type[User],
+        login_cache: UserLoginCache | None = None,
+        unique_filter: RedisBloomFilter | None = None,
+    ):
+        """
+        Args:
+            model (type[User]):
+            login_cache (UserLoginCache): 로그인 projection 캐시. None 이면 매번 DB 를 읽습니다.
+            unique_filter (RedisBloomFilter): email/handle 중복 확인용 Bloom filter. None 이면 매번 DB 를 읽습니다.
+        """
+        super().__init__(model)
+        self.login_cache = login_cache
+        self.unique_filter = unique_filter
+
+    async def _add_unique_values(self, *rows: dict) -> None:
+        # DB 에 쓰기 전에 추가하여, row 는 있는데 filter 에는 없는 순간이 생기지 않게 합니다.
+        if self.unique_filter is not None:
+            await self.unique_filter.add(
+                *(f"{field}:{row[field]}" for row in rows for field in _UNIQUE_FIELDS if field in row)
+            )
+
+    async def _forget_missing(self, session: Session, rows: Iterable[dict]) -> None:
+        # 새로 쓰인 email/handle 로 남아 있던 '없는 유저' 캐시를 commit 뒤에 지웁니다.
+        if self.login_cache is not None:
+            values = [(field, row[field]) for row in rows for field in _UNIQUE_FIELDS if field in row]
+            await self.after_commit(session, partial(self.login_cache.forget, values))
+
+    async def create(self, session: Session, values: list[dict] | None = None, **kwargs):
+        rows = values or [kwargs]
+        await self._add_unique_values(*rows)
+        user = await super().create(session, values, **kwargs)
+        await self._forget_missing(session, rows)
+        return user
+
+    async def create_if_not_exists(self, session: Session, returning: list[str] | None = None, **kwargs):
+        await self._add_unique_values(kwargs)
+        user = await super().create_if_not_exists(session, returning, **kwargs)
+        if user is not None:
+            await self._forget_missing(session, [kwargs])
+        return user
+
+    async def upsert(
+        self,
+        session: Session,
+        values: Sequence[dict[str, Any]],
+        index_elements: list[str],
+        update_columns: list[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> None:
+        await self._add_unique_values(*values)
+        await super().upsert(session, values, index_elements, update_columns, chunk_size)
+        await self._forget_missing(session, values)
+
+    async def copy(
+        self,
+        session: Session,
+        rows: Iterable[Sequence[Any]] | pl.DataFrame,
+        columns: list[str] | None = None,
+        binary: bool = True,
+    ) -> None:
+        if isinstance(rows, pl.DataFrame):
+            values = rows.select(column for column in columns or rows.columns if column in _UNIQUE_FIELDS).to_dicts()
+        else:
+            rows = list(rows)
+            values = [dict(zip(columns or (), row)) for row in rows]
+
+        await self._add_unique_values(*values)
+        await super().copy(session, rows, columns, binary)
+        await self._forget_missing(session, values)
+
+    async def update_by_id(self, db: Session, id: int | str, **kwargs) -> None:
+        await self._add_unique_values(kwargs)
+        await super().update_by_id(db, id, **kwargs)
+        await self._forget_missing(db, [kwargs])
+
+    async def on_write(self, session: Session, ids: list[int | str]) -> None:
+        if self.login_cache is not None:
+            await self.login_cache.invalidate(ids)
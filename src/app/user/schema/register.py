@@ -35,6 +35,11 @@ class RegisterDto(HandleDto, EmailDto):
         return self
 
 
+class HandleAvailableResponse(BaseModel):
+    handle: str
+    available: bool
+
+
 class RegisterResponse(BaseModel):
     access: str
     refresh: str | None = None
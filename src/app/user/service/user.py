@@ -7,13 +7,14 @@ from webtool.auth import JWTService
 from src.app.user.repository.user import UserRepository
 from src.app.user.schema import login, register
 from src.core.dependencies.db import postgres_session
+from src.core.security import PasswordHasherBusyError, PasswordHasherPool
 
 
 class UserService:
-    def __init__(self, repository: UserRepository, jwt_service: JWTService):
+    def __init__(self, repository: UserRepository, jwt_service: JWTService, password_hasher: PasswordHasherPool):
         self.repository = repository
         self.jwt_service = jwt_service
-        self.password_hasher = argon2.PasswordHasher()
+        self.password_hasher = password_hasher
 
     @staticmethod
     def _user_to_claim(user):
@@ -31,24 +32,16 @@ class UserService:
         payload = self._user_to_claim(db_user)
         return await self.jwt_service.create_token(payload)
 
-    async def _is_register_valid(self, data: register.RegisterDto, session: postgres_session):
-        """
-        Parameters:
-            data: register.RegisterDto
-            session: Session
-
-        Returns: 읽은 유저 데이터
-        """
-        user = await self.repository.get_unique_fields(session, cast(str, data.email), data.handle)
-
-        if user.all():
+    async def _hash_password(self, password: str) -> str:
+        try:
+            return await self.password_hasher.hash(password)
+        except PasswordHasherBusyError:
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"email {data.email} already exists",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy",
+                headers={"Retry-After": "1"},
             )
 
-        return user
-
     async def _is_login_valid(self, data: login.LoginDto, session: postgres_session):
         """
         Parameters:
@@ -62,16 +55,30 @@ class UserService:
         else:
             user = await self.repository.get_user_by_handle(session, data.handle)
 
-        user = user.mappings().first()
-
         try:
-            self.password_hasher.verify(user.password, data.password)
+            await self.password_hasher.verify(user.password, data.password)
+        except PasswordHasherBusyError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy",
+                headers={"Retry-After": "1"},
+            )
         except (argon2.exceptions.Argon2Error, AttributeError, ValueError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Can not find user",
             )
 
+        # 해시 파라미터가 바뀐 경우 로그인에 성공한 비밀번호로 다시 해시합니다.
+        # 해시 풀이 가득 찬 경우 이미 확인된 로그인을 실패시키지 않고 다음 로그인으로 미룹니다.
+        if self.password_hasher.check_needs_rehash(user.password):
+            try:
+                password = await self.password_hasher.hash(data.password)
+            except PasswordHasherBusyError:
+                pass
+            else:
+                await self.repository.update_by_id(session, user.id, password=password)
+
         return user
 
     async def register_user(self, data: register.RegisterDto, session: postgres_session):
@@ -83,15 +90,40 @@ class UserService:
         Returns:
             tuple: access, refresh 토큰
         """
-        user = await self._is_register_valid(data, session)
-
-        data = data.model_dump(by_alias=True)
-        data["password"] = self.password_hasher.hash(data["password"])
-        user = await self.repository.create(session, **data)
+        conflict = HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"email {data.email} already exists",
+        )
+
+        # 만들어진 Bloom filter 가 있을 수 있다고 한 경우에만 DB 를 확인하여, 중복 가입 요청에 비밀번호 해시 비용을 쓰지 않습니다.
+        # 그 외에는 바로 생성하며, 중복은 create_if_not_exists 가 None 으로 알려 줍니다.
+        if await self.repository.filter_matches(email=data.email, handle=data.handle):
+            result = await self.repository.get_unique_fields(session, data.email, data.handle)
+            if result.first() is not None:
+                raise conflict
+
+        values = data.model_dump(by_alias=True)
+        values["password"] = await self._hash_password(values["password"])
+        user = await self.repository.create_if_not_exists(session, returning=["id", "email", "handle"], **values)
+
+        # email 또는 handle 이 이미 존재하는 경우
+        if user is None:
+            raise conflict
 
         access, refresh = await self._issue_tokens(user)
         return access, refresh
 
+    async def is_handle_available(self, handle: str, session: postgres_session) -> bool:
+        """
+        Parameters:
+            handle: 확인할 handle
+            session: Session
+
+        Returns:
+            bool: 사용할 수 있으면 True
+        """
+        return not await self.repository.handle_exists(session, handle)
+
     async def login_user(self, data: login.LoginDto, session: postgres_session):
         """
         Parameters:
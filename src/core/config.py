@@ -19,6 +19,37 @@ class JWT(BaseModel):
     refresh_token_expire_time: Annotated[int, Field(default=604800)]
 
 
+class HttpClientConfig(BaseModel):
+    max_connections: Annotated[int, Field(default=100)]
+    max_keepalive_connections: Annotated[int, Field(default=20)]
+    keepalive_expiry: Annotated[float, Field(default=30)]
+    max_requests_per_host: Annotated[int | None, Field(default=20)]
+    http2: Annotated[bool, Field(default=False)]
+    timeout: Annotated[float, Field(default=30)]
+
+
+class Argon2Config(BaseModel):
+    time_cost: Annotated[int, Field(default=3)]
+    memory_cost: Annotated[int, Field(default=65536)]
+    parallelism: Annotated[int, Field(default=4)]
+    hash_len: Annotated[int, Field(default=32)]
+    salt_len: Annotated[int, Field(default=16)]
+    max_workers: Annotated[int, Field(default=4)]
+    max_pending: Annotated[int, Field(default=64)]
+
+
+class UserCacheConfig(BaseModel):
+    enabled: Annotated[bool, Field(default=True)]
+    ttl: Annotated[int, Field(default=300)]
+    negative_ttl: Annotated[int, Field(default=30)]
+
+
+class BloomFilterConfig(BaseModel):
+    enabled: Annotated[bool, Field(default=True)]
+    capacity: Annotated[int, Field(default=1_000_000)]
+    error_rate: Annotated[float, Field(default=0.001)]
+
+
 class OAuthConfig(BaseModel):
     client_id: str
     secret_key: str
@@ -34,6 +65,10 @@ class AWS(BaseModel):
 
 class ApiAdapter(BaseModel):
     key: str
+    base_url: Annotated[str | None, Field(default=None)]
+    swagger_url: Annotated[str | None, Field(default=None)]
+    paths: list[str] = Field(default_factory=list)
+    refresh_interval: Annotated[float, Field(default=86400)]
 
 
 class Settings(BaseSettings):
@@ -51,12 +86,16 @@ class Settings(BaseSettings):
     swagger_url: Annotated[str, Field(default="/api")]
 
     jwt: Annotated[JWT, Field(default_factory=JWT)]
+    argon2: Annotated[Argon2Config, Field(default_factory=Argon2Config)]
+    user_cache: Annotated[UserCacheConfig, Field(default_factory=UserCacheConfig)]
+    user_filter: Annotated[BloomFilterConfig, Field(default_factory=BloomFilterConfig)]
     postgres: DataBaseConfig
     redis: DataBaseConfig
 
     aws: AWS
     oauth_google: OAuthConfig
 
+    http_client: Annotated[HttpClientConfig, Field(default_factory=HttpClientConfig)]
     open_fiscal_data_api: ApiAdapter
     gov_24_data_api: ApiAdapter
 
@@ -1,5 +1,8 @@
+import argon2
 from webtool.auth import AnnoSessionBackend, JWTBackend, RedisJWTService
 
+from src.core.security import PasswordHasherPool
+
 from .db import Redis, settings
 
 jwt_service = RedisJWTService(
@@ -11,3 +14,15 @@ jwt_service = RedisJWTService(
 
 anno_backend = AnnoSessionBackend(session_name="th-session", secure=False)
 jwt_backend = JWTBackend(jwt_service)
+
+password_hasher = PasswordHasherPool(
+    argon2.PasswordHasher(
+        time_cost=settings.argon2.time_cost,
+        memory_cost=settings.argon2.memory_cost,
+        parallelism=settings.argon2.parallelism,
+        hash_len=settings.argon2.hash_len,
+        salt_len=settings.argon2.salt_len,
+    ),
+    max_workers=settings.argon2.max_workers,
+    max_pending=settings.argon2.max_pending,
+)
@@ -0,0 +1,44 @@
+import httpx
+
+from src.core.config import settings
+from src.core.utils.openapi.client import HttpClientPool
+from src.core.utils.openapi.data_loader import ApiConfig, FiscalDataLoader
+from src.core.utils.openapi.data_manager import PolarsDataManager
+from src.core.utils.openapi.data_saver import RedisDataSaver, TieredDataSaver
+
+from .db import Redis
+
+open_data_client = HttpClientPool(
+    limits=httpx.Limits(
+        max_connections=settings.http_client.max_connections,
+        max_keepalive_connections=settings.http_client.max_keepalive_connections,
+        keepalive_expiry=settings.http_client.keepalive_expiry,
+    ),
+    timeout=settings.http_client.timeout,
+    http2=settings.http_client.http2,
+    max_requests_per_host=settings.http_client.max_requests_per_host,
+)
+
+open_fiscal_data_loader = (
+    FiscalDataLoader(
+        settings.open_fiscal_data_api.base_url,
+        settings.open_fiscal_data_api.swagger_url,
+        api_key=settings.open_fiscal_data_api.key,
+        docs_saver=RedisDataSaver(Redis, key_prefix="openapi:"),
+        client_pool=open_data_client,
+    )
+    if settings.open_fiscal_data_api.base_url
+    else None
+)
+
+# 주기적으로 갱신할 열린재정 데이터. API Endpoint -> PolarsDataManager
+open_fiscal_data_managers = {
+    path: PolarsDataManager(
+        open_fiscal_data_loader,
+        TieredDataSaver(RedisDataSaver(Redis, key_prefix="fiscal:")),
+        path,
+        partition_key=ApiConfig.request_year,
+        lock_cache=Redis,
+    )
+    for path in (settings.open_fiscal_data_api.paths if open_fiscal_data_loader else [])
+}
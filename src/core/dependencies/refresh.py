@@ -0,0 +1,9 @@
+from src.core.utils.openapi.scheduler import RefreshScheduler
+
+from .db import Redis, settings
+from .openapi import open_fiscal_data_managers
+
+data_refresh_scheduler = RefreshScheduler(Redis)
+
+for manager in open_fiscal_data_managers.values():
+    data_refresh_scheduler.add(manager, settings.open_fiscal_data_api.refresh_interval)
@@ -0,0 +1,9 @@
+from collections.abc import Awaitable, Callable
+
+# app 이 시작될 때 background 로 실행할 작업. 각 app 의 dependencies 에서 등록합니다.
+startup_tasks: list[Callable[[], Awaitable[None]]] = []
+
+
+def on_startup(task: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    startup_tasks.append(task)
+    return task
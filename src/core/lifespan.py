@@ -1,16 +1,42 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
+from src.core.dependencies.auth import password_hasher
 from src.core.dependencies.db import Postgres, Redis
+from src.core.dependencies.openapi import open_data_client
+from src.core.dependencies.refresh import data_refresh_scheduler
+from src.core.dependencies.startup import startup_tasks
+
+logger = logging.getLogger(__name__)
+
+
+async def run_startup_task(task):
+    try:
+        await task()
+    except Exception:
+        logger.exception("Startup task %s failed", task.__qualname__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # app start
+    open_data_client.open()
+    await data_refresh_scheduler.start()
+    # 오래 걸릴 수 있는 작업이 시작을 막지 않도록 background 로 실행합니다.
+    tasks = [asyncio.create_task(run_startup_task(task)) for task in startup_tasks]
 
     yield
 
     # app shutdown
+    for task in tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*tasks)
+    await data_refresh_scheduler.stop()
+    await open_data_client.aclose()
+    password_hasher.shutdown()
     await Postgres.aclose()
     await Redis.aclose()
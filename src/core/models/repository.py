@@ -1,38 +1,291 @@
+import base64
+import datetime
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
 from typing import Any, Sequence, TypeVar, cast
 
-from sqlalchemy import Result, delete, insert, select, update
+import polars as pl
+from psycopg import sql
+from sqlalchemy import Result, Row, bindparam, delete, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession as Session
 from sqlalchemy.orm import DeclarativeBase
 
+from .unit_of_work import get_unit_of_work
+
 T = TypeVar("T", bound=DeclarativeBase)
 _P = Result[tuple[Any]]
 
 
+def chunked(values: Iterable, size: int) -> Iterable[list]:
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def encode_cursor(values: list[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str, length: int | None = None) -> list[Any]:
+    """
+    Parameters:
+        cursor: encode_cursor 로 만든 cursor
+        length: 기대하는 값의 개수. 다르면 ValueError
+
+    Returns:
+        cursor 에 담긴 값
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+
+    if not isinstance(values, list) or (length is not None and len(values) != length):
+        raise ValueError("Invalid cursor.")
+    if any(value is None or isinstance(value, (list, dict)) for value in values):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+@dataclass
+class Page:
+    """
+    Attributes:
+        items (list): 조회된 row. columns 를 지정하지 않은 경우 entity
+        next_cursor (str): 다음 페이지의 cursor. 마지막 페이지면 None
+    """
+
+    items: list
+    next_cursor: str | None
+
+
 class BaseRepository[T]:
     model: type[T]
     session: type[Session]
 
     def __init__(self, model: type[T]):
         self.model = model
+        self._columns: dict[tuple[str, ...], list] = {}
+        self._statements: dict[Hashable, Any] = {}
 
     def get_columns(self, columns: list[str] | None) -> list:
-        if columns:
-            return [getattr(self.model, column) for column in columns]
-        return [self.model]
+        if not columns:
+            return [self.model]
+
+        key = tuple(columns)
+        resolved = self._columns.get(key)
+        if resolved is None:
+            resolved = self._columns[key] = [getattr(self.model, column) for column in columns]
+        return resolved
+
+    def get_statement(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        값을 bindparam 으로 받는 statement 를 key 별로 한 번만 만들어 재사용합니다.
+        같은 statement 객체는 SQLAlchemy 의 컴파일 캐시를 바로 찾으며, UnitOfWork 에서 executemany 로 묶일 수 있습니다.
+        """
+        stmt = self._statements.get(key)
+        if stmt is None:
+            stmt = self._statements[key] = factory()
+        return stmt
+
+    @staticmethod
+    async def commit(session: Session) -> None:
+        """
+        UnitOfWork 범위 밖에서는 commit 하고, 범위 안에서는 범위를 벗어날 때 한 번 commit 하도록 flush 만 합니다.
+        """
+        unit_of_work = get_unit_of_work(session)
+        if unit_of_work is None:
+            await session.commit()
+        elif not unit_of_work.defer_writes:
+            await session.flush()
+
+    @staticmethod
+    async def execute_write(
+        session: Session, stmt: Any, params: dict[str, Any] | list[dict[str, Any]] | None = None
+    ) -> None:
+        """
+        쓰기를 미루는 UnitOfWork 범위 안에서는 실행하지 않고 모아 둡니다.
+        """
+        unit_of_work = get_unit_of_work(session)
+        if unit_of_work is not None and unit_of_work.defer_writes:
+            unit_of_work.queue(stmt, params)
+        elif params is None:
+            await session.execute(stmt)
+        else:
+            await session.execute(stmt, params)
+
+    @staticmethod
+    async def after_commit(session: Session, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        UnitOfWork 범위 안에서는 트랜잭션이 commit 된 뒤로 미루고, 범위 밖에서는 이미 commit 되었으므로 바로 실행합니다.
+        """
+        unit_of_work = get_unit_of_work(session)
+        if unit_of_work is None:
+            await callback()
+        else:
+            unit_of_work.after_commit(callback)
+
+    async def on_write(self, session: Session, ids: list[int | str]) -> None:
+        """
+        update/delete/upsert 가 commit 된 뒤에 호출됩니다. 캐시를 지워야 하는 repository 에서 override 합니다.
+
+        Parameters:
+            session: Session
+            ids: 바뀐 row 의 id
+        """
+        return None
+
+    @staticmethod
+    async def flush_writes(session: Session) -> None:
+        """
+        결과를 읽어야 하는 요청 전에 모아 둔 쓰기를 실행합니다.
+        """
+        unit_of_work = get_unit_of_work(session)
+        if unit_of_work is not None and unit_of_work.defer_writes:
+            await unit_of_work.flush()
 
 
 class BaseCreateRepository[T](BaseRepository[T]):
     async def _create(self, session: Session, **kwargs: Any) -> T:
-        session.add(entity := self.model(**kwargs))
-        await session.commit()
-        await session.refresh(entity)
+        """
+        INSERT ... RETURNING 으로 생성하여, server default (id, created_at 등) 를 다시 읽는 SELECT 없이 반환합니다.
+        """
+        stmt = self.get_statement("create", lambda: insert(self.model).returning(self.model))
+        await self.flush_writes(session)
+        entity = await session.scalar(stmt, kwargs)
+        await self.commit(session)
 
         return entity
 
-    async def _bulk_create(self, session: Session, kwargs: Sequence[dict[str, Any]]) -> None:
-        stmt = insert(self.model).values(kwargs)
-        await session.execute(stmt)
-        await session.commit()
+    async def _bulk_create(self, session: Session, kwargs: Sequence[dict[str, Any]], chunk_size: int = 1000) -> None:
+        """
+        bind 파라미터 수 제한을 넘지 않도록 chunk_size 개씩 executemany 로 생성합니다.
+        """
+        stmt = insert(self.model)
+        for chunk in chunked(kwargs, chunk_size):
+            await self.execute_write(session, stmt, chunk)
+        await self.commit(session)
+
+    async def upsert(
+        self,
+        session: Session,
+        values: Sequence[dict[str, Any]],
+        index_elements: list[str],
+        update_columns: list[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> None:
+        """
+        INSERT ... ON CONFLICT DO UPDATE 로 생성하거나 갱신합니다.
+
+        Parameters:
+            session: Session
+            values: 생성할 값
+            index_elements: 충돌을 판단하는 unique 컬럼
+            update_columns: 충돌 시 갱신할 컬럼. 없으면 values 의 컬럼 중 index_elements 를 제외한 전체.
+                갱신할 컬럼이 없으면 충돌한 row 는 무시합니다.
+            chunk_size: executemany 한 번에 보낼 row 수
+        """
+        if not values:
+            return
+
+        stmt = postgresql.insert(self.model)
+        if update_columns is None:
+            update_columns = [column for column in values[0] if column not in index_elements]
+
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={column: stmt.excluded[column] for column in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+        stmt = stmt.returning(self.model.id)
+
+        # 갱신된 row 의 id 를 on_write 에 넘겨야 하므로 미루지 않고 바로 실행합니다.
+        await self.flush_writes(session)
+        ids = []
+        for chunk in chunked(values, chunk_size):
+            result = await session.execute(stmt, chunk)
+            ids.extend(result.scalars())
+        await self.commit(session)
+        await self.after_commit(session, partial(self.on_write, session, ids))
+
+    async def copy(
+        self,
+        session: Session,
+        rows: Iterable[Sequence[Any]] | pl.DataFrame,
+        columns: list[str] | None = None,
+        binary: bool = True,
+    ) -> None:
+        """
+        psycopg 의 COPY FROM STDIN 으로 대량의 row 를 생성합니다. 가장 빠르지만 충돌 처리는 할 수 없습니다.
+
+        Parameters:
+            session: Session
+            rows: 생성할 row. DataFrame 인 경우 컬럼 이름을 그대로 사용합니다.
+            columns: rows 의 컬럼 순서. DataFrame 이 아닌 경우 필수
+            binary: binary 포맷 사용 여부. 컬럼 타입이 테이블에서 결정되므로 텍스트 변환 비용이 없습니다.
+        """
+        if isinstance(rows, pl.DataFrame):
+            columns = columns or rows.columns
+            rows = rows.select(columns).iter_rows()
+        if not columns:
+            raise ValueError("'columns' is required for COPY.")
+
+        table = self.model.__table__
+        stmt = sql.SQL("COPY {table} ({columns}) FROM STDIN {options}").format(
+            table=sql.Identifier(*filter(None, (table.schema, table.name))),
+            columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+            options=sql.SQL("(FORMAT BINARY)" if binary else ""),
+        )
+
+        await self.flush_writes(session)
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+
+        async with raw_connection.driver_connection.cursor() as cursor:
+            async with cursor.copy(stmt) as copy:
+                if binary:
+                    copy.set_types([self._get_type_name(table.columns[column]) for column in columns])
+                for row in rows:
+                    await copy.write_row(row)
+
+        await self.commit(session)
+
+    @staticmethod
+    def _get_type_name(column) -> str:
+        return column.type.compile(dialect=postgresql.dialect()).split("(")[0].lower()
+
+    async def create_if_not_exists(
+        self, session: Session, returning: list[str] | None = None, **kwargs: Any
+    ) -> Row[tuple[Any]] | None:
+        """
+        INSERT ... ON CONFLICT DO NOTHING RETURNING 으로 한 번의 왕복으로 생성합니다.
+
+        Parameters:
+            session: Session
+            returning: 반환할 컬럼. 없으면 전체
+            **kwargs: 생성할 값
+
+        Returns:
+            생성된 row. unique 제약 조건과 충돌하여 생성되지 않은 경우 None
+        """
+        stmt = (
+            postgresql.insert(self.model)
+            .values(**kwargs)
+            .on_conflict_do_nothing()
+            .returning(*self.get_columns(returning))
+        )
+        await self.flush_writes(session)
+        result = await session.execute(stmt)
+        row = result.first()
+        await self.commit(session)
+
+        return row
 
     async def create(self, session: Session, values: Sequence[dict[str, Any]] | None = None, **kwargs: Any) -> T | None:
         if kwargs:
@@ -47,40 +300,157 @@ class BaseReadRepository[T](BaseRepository[T]):
     async def get(self, session: Session, filters: Sequence, columns: list[str] | None = None) -> _P:
         columns = self.get_columns(columns)
         stmt = select(*columns).where(*filters)
+        await self.flush_writes(session)
         result = await session.execute(stmt)
 
         return result
 
-    async def get_by_id(self, session: Session, id: int | str, columns: list[str] | None = None) -> _P:
-        columns = self.get_columns(columns)
-        stmt = select(*columns).where(cast("ColumnElement[bool]", self.model.id == id))
+    async def paginate(
+        self,
+        session: Session,
+        filters: Sequence = (),
+        columns: list[str] | None = None,
+        order_by: str = "id",
+        descending: bool = False,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> Page:
+        """
+        (order_by, id) 를 기준으로 keyset pagination 을 합니다. OFFSET 과 달리 페이지가 깊어져도 인덱스로 바로 찾아갑니다.
+
+        Parameters:
+            session: Session
+            filters: 조건
+            columns: 조회할 컬럼. cursor 에 필요한 order_by, id 는 자동으로 포함됩니다.
+            order_by: 정렬 컬럼. NULL 이 없어야 합니다.
+            descending: 내림차순 여부
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
+
+        Returns:
+            Page
+        """
+        sort_column, id_column = getattr(self.model, order_by), self.model.id
+        keys = [order_by] if order_by == "id" else [order_by, "id"]
+
+        if columns:
+            columns = columns + [key for key in keys if key not in columns]
+        stmt = select(*self.get_columns(columns)).where(*filters)
+
+        if cursor:
+            try:
+                values = [
+                    self._decode_value(getattr(self.model, key), value)
+                    for key, value in zip(keys, decode_cursor(cursor, len(keys)))
+                ]
+            except (ValueError, TypeError):
+                raise ValueError("Invalid cursor.")
+            key_columns = tuple_(sort_column, id_column) if len(keys) > 1 else sort_column
+            key_values = tuple_(*values) if len(keys) > 1 else values[0]
+            stmt = stmt.where(key_columns < key_values if descending else key_columns > key_values)
+
+        order = [sort_column, id_column] if len(keys) > 1 else [sort_column]
+        stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in order)).limit(limit + 1)
+
+        await self.flush_writes(session)
         result = await session.execute(stmt)
+        items = list(result.all() if columns else result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], key) for key in keys])
+
+        return Page(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_value(column, value: Any) -> Any:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+
+        if python_type in (datetime.datetime, datetime.date) and isinstance(value, str):
+            return python_type.fromisoformat(value)
+        return value
+
+    async def stream(
+        self,
+        session: Session,
+        filters: Sequence = (),
+        columns: list[str] | None = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Any]:
+        """
+        server-side cursor 로 yield_per 개씩 받아 row 를 하나씩 반환합니다. 전체 결과를 메모리에 올리지 않습니다.
+
+        Yields:
+            row. columns 를 지정하지 않은 경우 entity
+        """
+        stmt = select(*self.get_columns(columns)).where(*filters).execution_options(yield_per=yield_per)
+        await self.flush_writes(session)
+        result = await session.stream(stmt)
+        if not columns:
+            result = result.scalars()
+
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
+
+    async def get_by_id(self, session: Session, id: int | str, columns: list[str] | None = None) -> _P:
+        stmt = self.get_statement(
+            ("get_by_id", tuple(columns or ())),
+            lambda: select(*self.get_columns(columns)).where(
+                cast("ColumnElement[bool]", self.model.id == bindparam("_id"))
+            ),
+        )
+        await self.flush_writes(session)
+        result = await session.execute(stmt, {"_id": id})
 
         return result
 
 
 class BaseUpdateRepository[T](BaseRepository[T]):
     async def filter(self, db: Session, filters: Sequence, **kwargs) -> None:
-        query = update(self.model).where(*filters).values(**kwargs)
-        await db.execute(query)
-        await db.commit()
+        # 바뀐 row 의 id 를 on_write 에 넘겨야 하므로 미루지 않고 바로 실행합니다.
+        query = update(self.model).where(*filters).values(**kwargs).returning(self.model.id)
+        await self.flush_writes(db)
+        result = await db.execute(query)
+        ids = list(result.scalars())
+        await self.commit(db)
+        await self.after_commit(db, partial(self.on_write, db, ids))
 
     async def update_by_id(self, db: Session, id: int | str, **kwargs) -> None:
-        query = update(self.model).where(cast("ColumnElement[bool]", self.model.id == id)).values(**kwargs)
-        await db.execute(query)
-        await db.commit()
+        table = self.model.__table__
+        query = self.get_statement(
+            ("update_by_id", tuple(sorted(kwargs))),
+            lambda: (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values({column: bindparam(f"_{column}") for column in kwargs})
+            ),
+        )
+        await self.execute_write(db, query, {"_id": id, **{f"_{column}": value for column, value in kwargs.items()}})
+        await self.commit(db)
+        await self.after_commit(db, partial(self.on_write, db, [id]))
 
 
 class BaseDeleteRepository[T](BaseRepository[T]):
     async def _delete(self, db: Session, id: int | str) -> None:
-        stmt = delete(self.model).where(cast("ColumnElement[bool]", self.model.id == id))
-        await db.execute(stmt)
-        await db.commit()
+        table = self.model.__table__
+        stmt = self.get_statement("delete", lambda: delete(table).where(table.c.id == bindparam("_id")))
+        await self.execute_write(db, stmt, {"_id": id})
+        await self.commit(db)
+        await self.after_commit(db, partial(self.on_write, db, [id]))
 
     async def _bulk_delete(self, db: Session, ids: list[int | str]) -> None:
-        stmt = delete(self.model).where(cast("ColumnElement[bool]", self.model.id.in_(ids)))
-        await db.execute(stmt)
-        await db.commit()
+        table = self.model.__table__
+        stmt = self.get_statement(
+            "bulk_delete", lambda: delete(table).where(table.c.id.in_(bindparam("_ids", expanding=True)))
+        )
+        await self.execute_write(db, stmt, {"_ids": ids})
+        await self.commit(db)
+        await self.after_commit(db, partial(self.on_write, db, ids))
 
     async def delete(self, db: Session, id: int | str | tuple[int | str] | list[int | str]) -> None:
         if isinstance(id, (int, str)):
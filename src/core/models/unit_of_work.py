@@ -0,0 +1,117 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import BindParameter, Executable
+from sqlalchemy.ext.asyncio import AsyncSession as Session
+from sqlalchemy.ext.asyncio import AsyncSessionTransaction
+from sqlalchemy.sql.visitors import iterate
+
+_KEY = "unit_of_work"
+
+
+def get_unit_of_work(session: Session) -> "UnitOfWork | None":
+    return session.info.get(_KEY)
+
+
+def is_batchable(stmt: Executable) -> bool:
+    """
+    expanding bindparam (IN 목록) 이 있는 statement 는 executemany 로 보낼 수 없습니다.
+    """
+    return not any(isinstance(element, BindParameter) and element.expanding for element in iterate(stmt))
+
+
+class UnitOfWork:
+    """
+    여러 repository 호출을 하나의 트랜잭션으로 묶는 클래스
+    범위 안의 repository 호출은 commit 하지 않고 flush 만 하며, 범위를 정상적으로 벗어날 때 한 번 commit 합니다.
+    예외가 발생하면 rollback 합니다. 이미 UnitOfWork 가 있는 session 에서 열면 savepoint 로 동작합니다.
+    after_commit 으로 등록한 callback 은 트랜잭션이 실제로 commit 된 뒤에 실행됩니다.
+
+    Example:
+        async with UnitOfWork(session) as uow:
+            await repository.update_by_id(session, 1, name="a")
+            async with uow.savepoint():
+                await repository.delete(session, 2)
+    """
+
+    def __init__(self, session: Session, defer_writes: bool = False):
+        """
+        Args:
+            session (Session):
+            defer_writes (bool): 쓰기를 바로 실행하지 않고 모아 두었다가, 읽기 전이나 범위를 벗어날 때 실행합니다.
+                같은 statement 가 연속되면 executemany 한 번으로 보냅니다.
+        """
+        self.session = session
+        self.defer_writes = defer_writes
+        self._queue: list[tuple[Executable, dict[str, Any] | list[dict[str, Any]] | None]] = []
+        self._parent: UnitOfWork | None = None
+        self._savepoint: AsyncSessionTransaction | None = None
+        self._callbacks: list[Callable[[], Awaitable[None]]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._parent = get_unit_of_work(self.session)
+        if self._parent is not None:
+            await self._parent.flush()
+            self._savepoint = await self.session.begin_nested()
+
+        self.session.info[_KEY] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        callbacks, self._callbacks = self._callbacks, []
+        try:
+            if exc_type is None:
+                await self.flush()
+                await (self._savepoint.commit() if self._savepoint else self.session.commit())
+            else:
+                self._queue.clear()
+                await (self._savepoint.rollback() if self._savepoint else self.session.rollback())
+                return
+        finally:
+            self.session.info[_KEY] = self._parent
+
+        if self._parent is not None:
+            # savepoint 는 바깥 트랜잭션이 commit 되어야 실제로 반영됩니다.
+            self._parent._callbacks.extend(callbacks)
+            return
+        for callback in callbacks:
+            await callback()
+
+    def savepoint(self) -> "UnitOfWork":
+        """
+        실패해도 바깥 트랜잭션에 영향을 주지 않는 하위 범위를 엽니다.
+        """
+        return UnitOfWork(self.session, self.defer_writes)
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        트랜잭션이 commit 된 뒤에 실행할 callback 을 등록합니다. rollback 되면 실행하지 않습니다.
+        """
+        self._callbacks.append(callback)
+
+    def queue(self, stmt: Executable, params: dict[str, Any] | list[dict[str, Any]] | None = None) -> None:
+        self._queue.append((stmt, params))
+
+    async def flush(self) -> None:
+        """
+        모아 둔 쓰기를 실행하고 session 을 flush 합니다.
+        """
+        queue, self._queue = self._queue, []
+
+        batch: list[dict[str, Any]] = []
+        for index, (stmt, params) in enumerate(queue):
+            if params is None:
+                await self.session.execute(stmt)
+                continue
+            if not is_batchable(stmt):
+                await self.session.execute(stmt, params)
+                continue
+
+            batch.extend(params if isinstance(params, list) else [params])
+            next_stmt = queue[index + 1][0] if index + 1 < len(queue) else None
+            if next_stmt is not stmt or queue[index + 1][1] is None:
+                # 하나뿐이면 dict 로 보내야 ORM statement 가 bulk 모드로 바뀌지 않습니다.
+                await self.session.execute(stmt, batch[0] if len(batch) == 1 else batch)
+                batch = []
+
+        await self.session.flush()
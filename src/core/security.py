@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import argon2
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """
+    대기 중인 해시 작업이 max_pending 을 넘어 새 작업을 받을 수 없는 경우
+    """
+
+
+class PasswordHasherPool:
+    """
+    argon2 해시/검증을 event loop 가 아닌 전용 thread pool 에서 실행하는 클래스
+    argon2 는 해시 중 GIL 을 놓으므로 thread 로도 병렬 실행되며, 대기열이 가득 차면 바로 실패하여 요청이 쌓이지 않게 합니다.
+    """
+
+    def __init__(self, hasher: argon2.PasswordHasher | None = None, max_workers: int = 4, max_pending: int = 64):
+        """
+        Args:
+            hasher (argon2.PasswordHasher): 해시 파라미터
+            max_workers (int): 동시에 실행하는 해시 작업 수
+            max_pending (int): 실행 중인 작업을 포함해 받을 수 있는 최대 작업 수
+        """
+        self.hasher = hasher or argon2.PasswordHasher()
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="argon2")
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise PasswordHasherBusyError("Too many pending password hash operations.")
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hasher.hash, password)
+
+    async def verify(self, hash: str, password: str) -> bool:
+        """
+        Raises:
+            argon2.exceptions.VerificationError: 비밀번호가 일치하지 않는 경우
+            argon2.exceptions.InvalidHashError: hash 가 argon2 해시가 아닌 경우
+            PasswordHasherBusyError: 대기열이 가득 찬 경우
+        """
+        return await self._run(self.hasher.verify, hash, password)
+
+    def check_needs_rehash(self, hash: str) -> bool:
+        """
+        hash 가 현재 파라미터와 다른 파라미터로 만들어진 경우 True 를 반환합니다. 해시 문자열만 비교하므로 event loop 에서 호출합니다.
+        """
+        return self.hasher.check_needs_rehash(hash)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
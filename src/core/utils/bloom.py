@@ -0,0 +1,181 @@
+import hashlib
+import logging
+import math
+from collections.abc import AsyncIterable, Callable, Iterable
+
+from redis.exceptions import LockError, RedisError
+from webtool.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+# 준비 bit 가 켜진 bitmap 에만 bit 를 켭니다. key 가 없거나 아직 만들어지지 않았으면 새로 만들지 않습니다.
+_ADD_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    if redis.call('GETBIT', key, ARGV[1]) == 1 then
+        for i = 2, #ARGV do
+            redis.call('SETBIT', key, ARGV[i], 1)
+        end
+    end
+end
+"""
+
+
+class RedisBloomFilter:
+    """
+    Redis bitmap (SETBIT/GETBIT) 으로 구현한 Bloom filter. RedisBloom 모듈 없이 동작합니다.
+    might_contain 이 False 이면 값이 확실히 없고, True 이면 있을 수도 있으므로 DB 로 확인해야 합니다.
+    값을 지울 수 없으므로 삭제된 값은 다음 rebuild 까지 '있을 수도 있음' 으로 남습니다.
+
+    bitmap 은 rebuild 로만 만들어지며, 다 만들어진 bitmap 에는 범위 밖 offset (size) 의 준비 bit 가 켜져 있습니다.
+    준비 bit 가 없으면 (아직 만들지 않았거나 evict 된 경우) might_contain 은 True 를 반환하고 add 는 아무것도 하지 않습니다.
+    Redis 에 문제가 있어도 True 를 반환하여 DB 로 확인하게 합니다.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        key: str,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        lock_timeout: float = 600,
+    ):
+        """
+        Args:
+            cache (RedisCache):
+            key (str): bitmap 을 저장할 key
+            capacity (int): 넣을 값의 예상 개수
+            error_rate (float): capacity 개를 넣었을 때의 false positive 비율
+            lock_timeout (float): rebuild 잠금 만료 (초). batch 마다 연장합니다.
+        """
+        self.cache = cache
+        self.key = key
+        self.building_key = f"{key}:building"
+        self.lock_key = f"{key}:lock"
+        self.lock_timeout = lock_timeout
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._add_script = cache.cache.register_script(_ADD_SCRIPT)
+
+    def get_offsets(self, value: str) -> list[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    async def might_contain(self, *values: str) -> bool:
+        """
+        Returns:
+            values 중 하나라도 있을 수 있으면 True. filter 를 쓸 수 없으면 True
+        """
+        return await self.contains(*values) is not False
+
+    async def contains(self, *values: str) -> bool | None:
+        """
+        Returns:
+            values 중 하나라도 있을 수 있으면 True, 확실히 없으면 False.
+            filter 가 만들어지지 않았거나 Redis 에 문제가 있어 알 수 없으면 None
+        """
+        try:
+            async with self.cache.cache.pipeline(transaction=False) as pipe:
+                pipe.getbit(self.key, self.size)
+                for value in values:
+                    for offset in self.get_offsets(value):
+                        pipe.getbit(self.key, offset)
+                ready, *bits = await pipe.execute()
+        except RedisError:
+            logger.warning("Failed to read bloom filter %s", self.key, exc_info=True)
+            return None
+
+        if not ready:
+            return None
+        return any(all(bits[i : i + self.hash_count]) for i in range(0, len(bits), self.hash_count))
+
+    async def add(self, *values: str) -> None:
+        """
+        만들어진 filter 와 rebuild 중인 filter 에 함께 넣어, rebuild 가 교체될 때 값이 빠지지 않게 합니다.
+        """
+        offsets = [offset for value in values for offset in self.get_offsets(value)]
+        if not offsets:
+            return
+
+        try:
+            await self._add_script(keys=[self.key, self.building_key], args=[self.size, *offsets])
+        except RedisError:
+            logger.warning("Failed to update bloom filter %s", self.key, exc_info=True)
+
+    async def _set_bits(self, key: str, values: Iterable[str]) -> None:
+        async with self.cache.cache.pipeline(transaction=False) as pipe:
+            for value in values:
+                for offset in self.get_offsets(value):
+                    pipe.setbit(key, offset, 1)
+            await pipe.execute()
+
+    async def rebuild(
+        self,
+        values: AsyncIterable[str],
+        catch_up: Callable[[], AsyncIterable[str]] | None = None,
+        batch_size: int = 10000,
+    ) -> int | None:
+        """
+        values 로 새 bitmap 을 만든 뒤 RENAME 으로 교체합니다. 교체 전까지는 이전 filter 를 그대로 사용합니다.
+        여러 worker 가 동시에 시작해도 잠금을 얻은 하나만 만듭니다.
+
+        Parameters:
+            values: 넣을 값 전체
+            catch_up: 교체 직전에 한 번 더 읽을 값. rebuild 를 시작하기 전에 add 되었지만
+                values 를 읽을 때 아직 commit 되지 않았던 값을 채웁니다.
+            batch_size: pipeline 한 번에 보낼 값의 개수
+
+        Returns:
+            넣은 값의 개수. 다른 worker 가 만들고 있으면 None
+        """
+        lock = self.cache.cache.lock(self.lock_key, timeout=self.lock_timeout, blocking=False)
+        if not await lock.acquire():
+            return None
+
+        try:
+            count = await self._build(lock, values, catch_up, batch_size)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("bloom filter %s rebuild outlived its lock", self.key)
+        return count
+
+    async def _build(self, lock, values, catch_up, batch_size: int) -> int:
+        # 준비 bit 를 먼저 켜서, 만드는 동안의 add 가 이 bitmap 에도 들어가게 합니다.
+        async with self.cache.cache.pipeline(transaction=True) as pipe:
+            pipe.delete(self.building_key)
+            pipe.setbit(self.building_key, self.size, 1)
+            pipe.expire(self.building_key, math.ceil(self.lock_timeout))
+            await pipe.execute()
+
+        count = 0
+        try:
+            for source in (values, catch_up() if catch_up else None):
+                if source is None:
+                    continue
+
+                batch = []
+                async for value in source:
+                    batch.append(value)
+                    if len(batch) >= batch_size:
+                        count += await self._write_batch(lock, batch)
+                        batch = []
+                if batch:
+                    count += await self._write_batch(lock, batch)
+
+            async with self.cache.cache.pipeline(transaction=True) as pipe:
+                pipe.rename(self.building_key, self.key)
+                pipe.persist(self.key)
+                await pipe.execute()
+        except BaseException:
+            await self.cache.cache.unlink(self.building_key)
+            raise
+        return count
+
+    async def _write_batch(self, lock, batch: list[str]) -> int:
+        await self._set_bits(self.building_key, batch)
+        await lock.reacquire()
+        await self.cache.cache.expire(self.building_key, math.ceil(self.lock_timeout))
+        return len(batch)
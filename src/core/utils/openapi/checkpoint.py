@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+
+def get_hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+class PageCheckpoint:
+    """
+    대량 다운로드의 완료된 페이지를 로컬 spool 디렉토리에 저장하여, 실패한 다운로드를 다시 실행하면 남은 페이지만 요청하는 클래스
+    manifest 에 전체 페이지 목록과 데이터의 signature (예: 연도별 row 수) 를 기록하며,
+    둘 중 하나라도 달라지거나 max_age 가 지나면 이전 페이지를 버리고 처음부터 다시 받습니다.
+    """
+
+    def __init__(self, directory: str | Path, max_age: float = 86400):
+        """
+        Args:
+            directory (str | Path): 이 다운로드의 페이지를 저장할 디렉토리
+            max_age (float): 이어받을 수 있는 checkpoint 의 최대 나이 (초)
+        """
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.jobs: list[str] = []
+        self.done: set[str] = set()
+
+    @staticmethod
+    def get_job_id(page: int, params: dict) -> str:
+        return get_hash([page, params])
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    @property
+    def pending(self) -> list[str]:
+        return [job_id for job_id in self.jobs if job_id not in self.done]
+
+    def _read_manifest(self) -> dict | None:
+        try:
+            return json.loads(self.manifest_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    async def open(self, jobs: list[tuple[int, dict]], signature: Any = None) -> "PageCheckpoint":
+        """
+        이전 checkpoint 가 같은 다운로드의 것이면 완료된 페이지를 불러오고, 아니면 새로 시작합니다.
+
+        Parameters:
+            jobs: 다운로드할 (page, params) 목록
+            signature: 데이터가 바뀌었는지 판단하는 값
+
+        Returns:
+            self
+        """
+        self.jobs = [self.get_job_id(page, params) for page, params in jobs]
+        signature = get_hash(signature)
+        manifest = await asyncio.to_thread(self._read_manifest)
+
+        if (
+            manifest is None
+            or manifest.get("jobs") != self.jobs
+            or manifest.get("signature") != signature
+            or time.time() - manifest.get("created_at", 0) > self.max_age
+        ):
+            await self.clear()
+            manifest = {"jobs": self.jobs, "signature": signature, "created_at": time.time()}
+            await asyncio.to_thread(self._create, json.dumps(manifest).encode())
+
+        self.done = set(await asyncio.to_thread(self._get_done))
+        return self
+
+    def _create(self, manifest: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self.manifest_path, manifest)
+
+    def _get_done(self) -> list[str]:
+        return [job_id for job_id in self.jobs if self._get_page_path(job_id).exists()]
+
+    def is_done(self, job_id: str) -> bool:
+        return job_id in self.done
+
+    def _get_page_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    @staticmethod
+    def _write(path: Path, value: bytes) -> None:
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_bytes(value)
+        os.replace(temp_path, path)
+
+    async def save(self, job_id: str, rows: list[dict]) -> None:
+        await asyncio.to_thread(self._write, self._get_page_path(job_id), json.dumps(rows).encode())
+        self.done.add(job_id)
+
+    async def load(self, job_id: str) -> list[dict]:
+        return json.loads(await asyncio.to_thread(self._get_page_path(job_id).read_bytes))
+
+    async def clear(self) -> None:
+        self.done = set()
+        await asyncio.to_thread(shutil.rmtree, self.directory, ignore_errors=True)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from importlib.util import find_spec
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientStats:
+    """
+    Attributes:
+        requests (int): 보낸 요청 수
+        connections (int): 새로 연결한 TCP 연결 수
+    """
+
+    requests: int = 0
+    connections: int = 0
+
+    @property
+    def reused(self) -> int:
+        """
+        기존 연결을 재사용한 요청 수
+        """
+        return max(self.requests - self.connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+
+class HttpClientPool:
+    """
+    여러 OpenDataLoader 가 앱이 실행되는 동안 공유하는 httpx.AsyncClient
+    연결을 유지하여 갱신할 때마다 TCP/TLS 연결을 다시 맺지 않습니다. http2 를 켜고 h2 (httpx[http2]) 가 설치되어 있으면
+    HTTP/2 로 요청을 다중화합니다.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits | None = None,
+        timeout: float = 30,
+        http2: bool = False,
+        max_requests_per_host: int | None = None,
+    ):
+        """
+        Args:
+            limits (httpx.Limits): 전체 연결 수, 유지할 연결 수와 유지 시간
+            timeout (float): 기본 timeout (초)
+            http2 (bool): HTTP/2 사용 여부. h2 가 설치되어 있지 않으면 HTTP/1.1 을 사용합니다.
+            max_requests_per_host (int): 호스트별 동시 요청 상한. 연결 수가 아닌 진행 중인 요청 수를 제한하며,
+                연결 수는 limits 로 제한합니다.
+        """
+        if http2 and find_spec("h2") is None:
+            logger.warning("h2 is not installed, falling back to HTTP/1.1")
+            http2 = False
+
+        self.limits = limits or httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+        self.timeout = timeout
+        self.http2 = http2
+        self.max_requests_per_host = max_requests_per_host
+        self.stats = ClientStats()
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.open()
+
+    def open(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self.get_client()
+        return self._client
+
+    def get_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            follow_redirects=True,
+            event_hooks={"request": [self._on_request]},
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def host_slot(self, url: httpx.URL | str):
+        """
+        호스트별 동시 요청 수를 max_requests_per_host 로 제한합니다.
+        """
+        if self.max_requests_per_host is None:
+            yield
+            return
+
+        host = httpx.URL(url).host
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.max_requests_per_host)
+
+        async with semaphore:
+            yield
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.stats.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.stats.connections += 1
@@ -0,0 +1,194 @@
+import gzip
+import io
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, fields
+from typing import Literal
+
+import polars as pl
+
+
+@dataclass
+class CodecMetrics:
+    """
+    캐시 읽기/쓰기 한 번에 각 단계가 소요한 시간 (초). 여러 스레드에서 실행된 단계는 합산됩니다.
+
+    Attributes:
+        serialize (float): DataFrame -> bytes
+        compress (float): 압축
+        decompress (float): 압축 해제
+        deserialize (float): bytes -> DataFrame
+        network (float): 캐시 서버와의 통신
+        size (int): 주고받은 값의 크기 (bytes)
+    """
+
+    serialize: float = 0.0
+    compress: float = 0.0
+    decompress: float = 0.0
+    deserialize: float = 0.0
+    network: float = 0.0
+    size: int = 0
+
+    def __add__(self, other: "CodecMetrics") -> "CodecMetrics":
+        return CodecMetrics(*(getattr(self, f.name) + getattr(other, f.name) for f in fields(self)))
+
+
+class BaseCodec(ABC):
+    """
+    DataFrame 을 캐시 값(bytes)으로 변환하는 클래스
+    인코딩은 serialize -> compress, 디코딩은 decompress -> deserialize 순서로 이루어집니다.
+
+    Attributes:
+        magic (bytes): 인코딩된 값의 시작 바이트. 저장된 값의 포맷을 판별하는 데 사용됩니다.
+    """
+
+    magic: bytes
+
+    @abstractmethod
+    def serialize(self, data: pl.DataFrame) -> bytes:
+        """
+        Parameters:
+            data (pl.DataFrame): 저장할 데이터
+
+        Returns:
+            직렬화된 값
+        """
+        pass
+
+    @abstractmethod
+    def deserialize(self, value: bytes) -> pl.DataFrame:
+        """
+        Parameters:
+            value (bytes): 직렬화된 값
+
+        Returns:
+            데이터
+        """
+        pass
+
+    def compress(self, value: bytes) -> bytes:
+        return value
+
+    def decompress(self, value: bytes) -> bytes:
+        return value
+
+    def encode(self, data: pl.DataFrame) -> bytes:
+        return self.compress(self.serialize(data))
+
+    def decode(self, value: bytes) -> pl.DataFrame:
+        return self.deserialize(self.decompress(value))
+
+    def can_decode(self, value: bytes) -> bool:
+        return value[: len(self.magic)] == self.magic
+
+
+class IpcCodec(BaseCodec):
+    """
+    Arrow IPC 포맷. 스키마가 함께 저장되므로 복원 시 타입 추론이 필요 없습니다.
+    압축은 컬럼 버퍼 단위로 직렬화 과정에 포함됩니다.
+    """
+
+    magic = b"ARROW1"
+
+    def __init__(self, compression: Literal["uncompressed", "lz4", "zstd"] = "zstd"):
+        self.compression = compression
+
+    def serialize(self, data: pl.DataFrame) -> bytes:
+        buffer = io.BytesIO()
+        data.write_ipc(buffer, compression=self.compression)
+        return buffer.getvalue()
+
+    def deserialize(self, value: bytes) -> pl.DataFrame:
+        return pl.read_ipc(value)
+
+
+class ParquetCodec(BaseCodec):
+    """
+    Parquet 포맷. IPC 보다 느리지만 압축률이 높습니다. 압축은 직렬화 과정에 포함됩니다.
+    """
+
+    magic = b"PAR1"
+
+    def __init__(
+        self, compression: Literal["lz4", "zstd", "snappy", "gzip"] = "zstd", compression_level: int | None = None
+    ):
+        self.compression = compression
+        self.compression_level = compression_level
+
+    def serialize(self, data: pl.DataFrame) -> bytes:
+        buffer = io.BytesIO()
+        data.write_parquet(buffer, compression=self.compression, compression_level=self.compression_level)
+        return buffer.getvalue()
+
+    def deserialize(self, value: bytes) -> pl.DataFrame:
+        return pl.read_parquet(value)
+
+
+class GzipJsonCodec(BaseCodec):
+    """
+    row 단위 JSON 을 gzip 으로 압축한 기존 포맷
+    """
+
+    magic = b"\x1f\x8b"
+
+    def __init__(self, infer_schema_length: int | None = 100000, compress_level: int = 6):
+        self.infer_schema_length = infer_schema_length
+        self.compress_level = compress_level
+
+    def serialize(self, data: pl.DataFrame) -> bytes:
+        return data.write_json().encode()
+
+    def deserialize(self, value: bytes) -> pl.DataFrame:
+        return pl.DataFrame(json.loads(value), infer_schema_length=self.infer_schema_length)
+
+    def compress(self, value: bytes) -> bytes:
+        return gzip.compress(value, compresslevel=self.compress_level)
+
+    def decompress(self, value: bytes) -> bytes:
+        return gzip.decompress(value)
+
+
+def get_codec(value: bytes, codecs: list[BaseCodec]) -> BaseCodec:
+    """
+    저장된 값의 포맷에 맞는 codec 을 반환합니다.
+
+    Parameters:
+        value (bytes): 인코딩된 값
+        codecs (list[BaseCodec]): 후보 codec 목록
+
+    Returns:
+        값을 디코딩할 수 있는 codec
+    """
+    for codec in codecs:
+        if codec.can_decode(value):
+            return codec
+    raise ValueError("Unsupported cache format.")
+
+
+def timed_encode(codec: BaseCodec, data: pl.DataFrame) -> tuple[bytes, CodecMetrics]:
+    """
+    단계별 시간을 측정하며 인코딩합니다. ProcessPoolExecutor 에서도 실행할 수 있도록 모듈 함수로 둡니다.
+    """
+    start = time.perf_counter()
+    value = codec.serialize(data)
+    serialized = time.perf_counter()
+    value = codec.compress(value)
+    compressed = time.perf_counter()
+
+    return value, CodecMetrics(serialize=serialized - start, compress=compressed - serialized, size=len(value))
+
+
+def timed_decode(codecs: list[BaseCodec], value: bytes) -> tuple[pl.DataFrame, CodecMetrics]:
+    """
+    단계별 시간을 측정하며 디코딩합니다. ProcessPoolExecutor 에서도 실행할 수 있도록 모듈 함수로 둡니다.
+    """
+    codec = get_codec(value, codecs)
+
+    start = time.perf_counter()
+    value = codec.decompress(value)
+    decompressed = time.perf_counter()
+    data = codec.deserialize(value)
+    deserialized = time.perf_counter()
+
+    return data, CodecMetrics(decompress=decompressed - start, deserialize=deserialized - decompressed)
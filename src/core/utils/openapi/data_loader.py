@@ -1,13 +1,33 @@
 import asyncio
-import json
+import logging
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from itertools import chain
 from math import ceil
+from pathlib import Path
+from typing import Any
 
 import httpx
 
+from .checkpoint import PageCheckpoint, get_hash
+from .client import HttpClientPool
+from .data_saver import BaseDataSaver
+from .decoder import BaseDecoder, get_default_decoder
+from .limiter import (
+    AdaptiveConcurrencyLimiter,
+    OpenDataConfigError,
+    OpenDataRequestError,
+    RetryPolicy,
+    parse_retry_after,
+)
+from .planner import FetchPlanner, FetchReport
+from .schema import Schema, schema_from_docs
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ApiConfig:
@@ -20,6 +40,7 @@ class ApiConfig:
     api_parameters: str = "parameters"
     api_parameters_name: str = "name"
     api_parameters_required: str = "required"
+    api_parameters_location: str = "in"
 
     header: str = "header"
     query: str = "query"
@@ -35,6 +56,27 @@ class ApiConfig:
     response_current_count: str = "currentCount"
     response_match_count: str = "matchCount"
     response_data: str = "data"
+    response_result: str = "RESULT"
+    response_result_code: str = "CODE"
+    response_empty_code: str = "INFO-200"
+
+
+@dataclass(frozen=True)
+class PathSpec:
+    """
+    API 문서의 path 정의를 요청에 필요한 정보만 남겨 한 번만 만들어 둔 것
+
+    Attributes:
+        path (str): API Endpoint
+        method (str): HTTP method
+        required (frozenset[str]): 필수 query 파라미터
+        schema (Schema): 문서에 선언된 컬럼의 dtype
+    """
+
+    path: str
+    method: str
+    required: frozenset[str] = frozenset()
+    schema: Schema = field(default_factory=dict)
 
 
 class BaseOpenDataLoader(ABC):
@@ -63,6 +105,73 @@ class BaseOpenDataLoader(ABC):
         """
         pass
 
+    async def stream_data(self, path: str, params: dict | None = None) -> AsyncIterator[list[dict]]:
+        """
+        데이터를 페이지 단위로 반환합니다. 기본 구현은 get_data 의 응답 전체를 하나의 페이지로 반환합니다.
+
+        Parameters:
+            path: API Endpoint
+            params: API Query Params
+
+        Yields:
+            페이지의 row 목록
+        """
+        data = await self.get_data(path, params)
+        yield data if isinstance(data, list) else [data]
+
+    async def get_partition_counts(self, path: str, params: dict | None = None) -> dict[str, int] | None:
+        """
+        데이터를 파티션(예: 회계연도) 단위로 나눌 수 있는 경우 파티션별 row 수를 반환합니다.
+
+        Parameters:
+            path: API Endpoint
+            params: API Query Params
+
+        Returns:
+            파티션별 row 수. 파티션을 지원하지 않으면 None
+        """
+        return None
+
+    @abstractmethod
+    def stream_partitions(
+        self,
+        path: str,
+        partitions: list[str],
+        params: dict | None = None,
+        counts: dict[str, int] | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        지정한 파티션의 데이터만 페이지 단위로 반환합니다. get_partition_counts 가 None 이 아닌 loader 에서만 호출됩니다.
+
+        Parameters:
+            path: API Endpoint
+            partitions: 불러올 파티션 목록
+            params: API Query Params
+            counts: get_partition_counts 로 이미 읽은 파티션별 row 수. 있으면 row 수를 다시 요청하지 않습니다.
+
+        Yields:
+            페이지의 row 목록
+        """
+        pass
+
+    def is_partition_settled(self, partition: str) -> bool:
+        """
+        row 수가 같다면 내용도 변하지 않았다고 볼 수 있는 파티션인지 반환합니다.
+        """
+        return False
+
+    def get_schema(self, path: str) -> Schema:
+        """
+        API 문서에 선언된 컬럼의 dtype 을 반환합니다. 데이터를 불러온 뒤에 호출해야 문서가 반영됩니다.
+
+        Parameters:
+            path: API Endpoint
+
+        Returns:
+            컬럼 -> dtype
+        """
+        return {}
+
 
 class OpenDataLoader(BaseOpenDataLoader):
     def __init__(
@@ -75,6 +184,16 @@ class OpenDataLoader(BaseOpenDataLoader):
         concurrency_limit: int = 20,
         timeout: int = 30,
         api_config: ApiConfig | None = None,
+        max_in_flight_pages: int | None = None,
+        max_concurrency_limit: int | None = None,
+        retry_policy: RetryPolicy | None = None,
+        docs_saver: BaseDataSaver | None = None,
+        docs_ttl: float = 3600,
+        client_pool: HttpClientPool | None = None,
+        decoder: BaseDecoder | None = None,
+        decode_in_thread_size: int = 1024 * 1024,
+        checkpoint_dir: str | Path | None = None,
+        checkpoint_max_age: float = 86400,
     ):
         """
         Initialize the OpenDataLoader with configurable parameters.
@@ -87,6 +206,17 @@ class OpenDataLoader(BaseOpenDataLoader):
             batch_size (int):
             timeout (int):
             api_config (ApiConfig):
+            max_in_flight_pages (int): 완료되었지만 소비되지 않은 페이지를 포함해 동시에 유지하는 최대 페이지 수
+            max_concurrency_limit (int): 응답이 원활할 때 concurrency_limit 에서 늘어날 수 있는 동시 요청 상한
+            retry_policy (RetryPolicy): 페이지 단위 재시도 정책
+            docs_saver (BaseDataSaver): API 문서를 프로세스 간에 공유할 저장소
+            docs_ttl (float): API 문서를 다시 확인하지 않고 사용하는 시간 (초). 이후에는 ETag/Last-Modified 로 재검증합니다.
+            client_pool (HttpClientPool): 앱 전체가 공유하는 연결. 없으면 요청마다 client 를 만들고 닫습니다.
+            decoder (BaseDecoder): 응답 본문 decoder. 기본값은 orjson 이 설치되어 있으면 orjson 을 사용합니다.
+            decode_in_thread_size (int): 이 크기 (bytes) 이상의 응답은 event loop 가 아닌 thread 에서 디코딩합니다.
+            checkpoint_dir (str | Path): 완료된 페이지를 저장할 디렉토리. 있으면 실패한 다운로드를 다시 실행할 때
+                남은 페이지만 요청합니다.
+            checkpoint_max_age (float): 이어받을 수 있는 checkpoint 의 최대 나이 (초)
         """
         self.base_url = base_url
         self.swagger_url = swagger_url
@@ -99,7 +229,22 @@ class OpenDataLoader(BaseOpenDataLoader):
         self._timeout = timeout
         self._batch_size = batch_size
         self._concurrency_limit = concurrency_limit
+        self._max_concurrency_limit = max_concurrency_limit or concurrency_limit * 4
+        self._max_in_flight_pages = max_in_flight_pages or self._max_concurrency_limit * 2
+        self._retry_policy = retry_policy or RetryPolicy()
         self._api_config = api_config or ApiConfig()
+        self._specs: dict[str, PathSpec] = {}
+        self._docs_entry: dict | None = None
+        self._applied_docs: dict | None = None
+        self._docs_saver = docs_saver
+        self._docs_ttl = docs_ttl
+        self._docs_checked_at = float("-inf")
+        self._docs_lock = asyncio.Lock()
+        self._client_pool = client_pool
+        self._decoder = decoder or get_default_decoder()
+        self._decode_in_thread_size = decode_in_thread_size
+        self._checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self._checkpoint_max_age = checkpoint_max_age
 
     def get_client(self):
         return httpx.AsyncClient(
@@ -110,13 +255,101 @@ class OpenDataLoader(BaseOpenDataLoader):
             follow_redirects=True,
         )
 
+    @asynccontextmanager
+    async def session(self):
+        """
+        client_pool 이 있으면 공유 client 를, 없으면 이 loader 전용 client 를 만들어 반환합니다.
+        """
+        if self._client_pool is not None:
+            yield self._client_pool.client
+            return
+
+        async with self.get_client() as client:
+            yield client
+
+    def get_url(self, path: str) -> str:
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    async def send(self, client: httpx.AsyncClient, method: str, path: str, params: dict) -> httpx.Response:
+        """
+        공유 client 에는 base_url, 인증 header/query 가 없으므로 요청마다 함께 보냅니다.
+        """
+        if self._client_pool is None:
+            return await client.request(method, path, params=params)
+
+        url = self.get_url(path)
+        async with self._client_pool.host_slot(url):
+            return await client.request(
+                method,
+                url,
+                params={**self.query_params, **params},
+                headers=self.headers,
+                timeout=self._timeout,
+            )
+
+    def get_limiter(self) -> AdaptiveConcurrencyLimiter:
+        return AdaptiveConcurrencyLimiter(
+            initial_limit=self._concurrency_limit,
+            max_limit=self._max_concurrency_limit,
+        )
+
     async def get_docs(self) -> dict:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url=self.swagger_url)
-        return response.json()
+        """
+        API 문서를 반환합니다. docs_ttl 동안은 메모리의 문서를 사용하고, 이후에는 저장된 ETag/Last-Modified 로
+        재검증하여 변경된 경우에만 문서를 다시 내려받습니다.
+        """
+        async with self._docs_lock:
+            entry = self._docs_entry
+            if entry is not None and time.monotonic() - self._docs_checked_at < self._docs_ttl:
+                return entry["docs"]
+
+            key = f"docs:{self.swagger_url}"
+            if entry is None and self._docs_saver:
+                entry = await self._docs_saver.get_metadata(key)
+            headers = {}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+            try:
+                if self._client_pool is not None:
+                    response = await self._client_pool.client.get(self.swagger_url, headers=headers)
+                else:
+                    async with httpx.AsyncClient(timeout=self._timeout, follow_redirects=True) as client:
+                        response = await client.get(url=self.swagger_url, headers=headers)
+                if response.status_code != httpx.codes.NOT_MODIFIED:
+                    response.raise_for_status()
+            except httpx.HTTPError:
+                if entry is None:
+                    raise
+                # 문서 서버에 접근할 수 없으면 가지고 있는 문서를 계속 사용합니다.
+                logger.warning("failed to revalidate %s, using cached docs", self.swagger_url, exc_info=True)
+                response = None
+
+            if response is not None and response.status_code != httpx.codes.NOT_MODIFIED:
+                entry = {
+                    "docs": response.json(),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+                if self._docs_saver:
+                    await self._docs_saver.set_metadata(key, entry)
+
+            self._docs_entry = entry
+            self._docs_checked_at = time.monotonic()
+            return entry["docs"]
+
+    async def prepare(self) -> None:
+        if self.swagger_url:
+            docs = await self.get_docs()
+            if docs is not self._applied_docs:
+                self.apply_docs(docs)
 
     def apply_docs(self, docs: dict):
+        self._applied_docs = docs
         self.paths.update(docs.get(self._api_config.api_path, {}))
+        self._specs.clear()
 
         if not self.api_key:
             return
@@ -133,159 +366,452 @@ class OpenDataLoader(BaseOpenDataLoader):
             if method == self._api_config.query:
                 self.query_params[name] = self.api_key
 
-    async def fetch_data(
-        self,
-        client: httpx.AsyncClient,
-        path: str,
-        params: dict | None = None,
-    ) -> dict:
-        params = {} if params is None else params
+    def get_schema(self, path: str) -> Schema:
+        return self.get_spec(path).schema if path in self.paths else {}
+
+    def get_spec(self, path: str) -> PathSpec:
+        """
+        path 의 PathSpec 을 반환합니다. 처음 요청될 때 한 번만 만들어지며, API 문서가 바뀌면 다시 만들어집니다.
+        """
+        spec = self._specs.get(path)
+        if spec is None:
+            spec = self._specs[path] = self.compile_path(path)
+        return spec
 
+    def compile_path(self, path: str) -> PathSpec:
         _path: dict | None = self.paths.get(path, None)
         if _path is None:
-            raise ValueError("The specified path could not be found.")
+            raise OpenDataConfigError(f"The specified path could not be found: {path}")
 
         _method = tuple(_path.keys())
         if not _method:
-            raise ValueError("The specified path cannot process requests.")
+            raise OpenDataConfigError(f"The specified path cannot process requests: {path}")
         _method = _method[0]
 
-        _parameters = _path[_method].get(self._api_config.api_parameters_name, {})
-        _parameters_required = {
+        _parameters = _path[_method].get(self._api_config.api_parameters, [])
+        _parameters_required = frozenset(
             v.get(self._api_config.api_parameters_name)
-            for v in _parameters.values()
+            for v in _parameters
             if v.get(self._api_config.api_parameters_required, False)
-        }
-        if not _parameters_required.issubset(set(params.keys())):
-            raise ValueError("Required parameters are missing.", _parameters_required)
+            and v.get(self._api_config.api_parameters_location, self._api_config.query) == self._api_config.query
+        )
+        _schema = schema_from_docs(_path, self._api_config.api_parameters, self._api_config.api_parameters_name)
+
+        return PathSpec(path=path, method=_method, required=_parameters_required, schema=_schema)
+
+    async def fetch_data(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        params: dict | None = None,
+    ) -> dict:
+        params = {} if params is None else params
+        spec = self.get_spec(path)
+
+        # API key 처럼 client 에 설정된 query 파라미터도 필수 파라미터로 인정합니다.
+        missing = spec.required.difference(params, self.query_params)
+        if missing:
+            raise OpenDataConfigError(f"Required parameters are missing: {sorted(missing)}")
 
         try:
-            response = await getattr(client, _method)(path, params=params)
+            response = await self.send(client, spec.method, path, params)
             response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            raise ValueError(f"HTTP error occurred: {e.response.status_code}, {e.response.text}")
+            raise OpenDataRequestError(
+                f"HTTP error occurred: {e.response.status_code}, {e.response.text}",
+                status_code=e.response.status_code,
+                retry_after=parse_retry_after(e.response.headers.get("Retry-After")),
+            )
         except httpx.RequestError as e:
-            raise ValueError(f"A request error occurred: {str(e)}")
+            raise OpenDataRequestError(f"A request error occurred: {str(e)}")
 
         try:
-            data = response.json()
-            return json.loads(data) if isinstance(data, str) else data
-        except (KeyError, IndexError, json.JSONDecodeError) as e:
+            return await self.decode(response.content)
+        except ValueError as e:
             raise ValueError(f"Unable to retrieve data: {e}")
 
+    async def decode(self, content: bytes) -> dict | list:
+        if len(content) >= self._decode_in_thread_size:
+            return await asyncio.to_thread(self._decoder.decode, content)
+        return self._decoder.decode(content)
+
+    async def fetch_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        params: dict | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+    ) -> dict:
+        """
+        limiter 의 슬롯을 점유한 채 fetch_data 를 호출하고, 실패 시 retry_policy 에 따라 재시도합니다.
+        대기는 슬롯을 반납한 뒤에 이루어집니다.
+        """
+        limiter = limiter or self.get_limiter()
+
+        for attempt in range(self._retry_policy.max_retries + 1):
+            async with limiter:
+                try:
+                    response = await self.fetch_data(client, path, params)
+                except OpenDataRequestError as e:
+                    if attempt == self._retry_policy.max_retries or not self._retry_policy.is_retryable(e):
+                        raise
+                    if self._retry_policy.is_throttled(e):
+                        limiter.on_throttle()
+                    delay = self._retry_policy.get_delay(attempt, e.retry_after)
+                else:
+                    limiter.on_success()
+                    return response
+
+            await asyncio.sleep(delay)
+
     async def fetch_total_record_count(
         self,
         client: httpx.AsyncClient,
         path: str,
         params: dict,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
     ) -> int:
         params[self._api_config.request_page] = 1
         params[self._api_config.request_size] = 1
 
-        data = await self.fetch_data(client, path, params)
+        data = await self.fetch_with_retry(client, path, params, limiter)
         data = data.get(self._api_config.response_total_count, 0)
 
         return data
 
+    def _extract_page(self, path: str, response: dict) -> list[dict]:
+        return response.get(self._api_config.response_data)
+
+    async def get_checkpoint(
+        self, path: str, params: dict, jobs: list[tuple[int, dict]], signature: Any = None, kind: str = "pages"
+    ) -> PageCheckpoint | None:
+        """
+        checkpoint_dir 이 설정된 경우 path 와 params 의 다운로드에 대한 checkpoint 를 엽니다.
+        kind 는 같은 path, params 의 서로 다른 다운로드 (예: 전체/일부 파티션) 가 서로의 checkpoint 를 지우지 않도록 구분합니다.
+        """
+        if self._checkpoint_dir is None:
+            return None
+
+        checkpoint = PageCheckpoint(self._checkpoint_dir / get_hash([kind, path, params]), self._checkpoint_max_age)
+        await checkpoint.open(jobs, signature)
+        if checkpoint.done:
+            logger.info("%s: resuming download, %d/%d pages done", path, len(checkpoint.done), len(checkpoint.jobs))
+        return checkpoint
+
+    async def _fetch_page(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        page: int,
+        params: dict,
+        limiter: AdaptiveConcurrencyLimiter,
+        checkpoint: PageCheckpoint | None = None,
+    ) -> list[dict]:
+        if checkpoint is None:
+            return await self._page_fetcher(client, path, page, params, limiter)
+
+        job_id = checkpoint.get_job_id(page, params)
+        if checkpoint.is_done(job_id):
+            return await checkpoint.load(job_id)
+
+        rows = await self._page_fetcher(client, path, page, params, limiter)
+        await checkpoint.save(job_id, rows)
+        return rows
+
     async def _page_fetcher(
         self,
         client: httpx.AsyncClient,
         path: str,
         page: int,
         params: dict | None = None,
-        semaphore: asyncio.Semaphore = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
     ):
-        async with semaphore if semaphore else asyncio.Semaphore(self._concurrency_limit):
-            params[self._api_config.request_page] = page
-            response = await self.fetch_data(client, path, params)
-            return response.get(self._api_config.response_data)
+        params = {} if params is None else params
+        response = await self.fetch_with_retry(client, path, {**params, self._api_config.request_page: page}, limiter)
+        return self._extract_page(path, response)
+
+    async def _run_pages(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        jobs: Iterable[tuple[int, dict]],
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        checkpoint: PageCheckpoint | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        (page, params) 작업을 완료되는 순서대로 반환합니다.
+        동시에 유지되는 작업은 max_in_flight_pages 개를 넘지 않으므로 메모리 사용량은 데이터 크기가 아닌 윈도우 크기에 비례합니다.
+        checkpoint 가 있으면 완료된 페이지는 저장된 것을 반환하고, 모든 페이지를 반환한 뒤 checkpoint 를 지웁니다.
+        """
+        limiter = limiter or self.get_limiter()
+        jobs = iter(jobs)
+        pending: set[asyncio.Task] = set()
+
+        try:
+            while True:
+                while len(pending) < self._max_in_flight_pages and (job := next(jobs, None)) is not None:
+                    page, params = job
+                    pending.add(asyncio.create_task(self._fetch_page(client, path, page, params, limiter, checkpoint)))
+
+                if not pending:
+                    if checkpoint is not None:
+                        await checkpoint.clear()
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 같은 순간에 여러 페이지가 실패하면 첫 예외만 올리고, 나머지도 꺼내어 기록합니다.
+                failed = [task for task in done if task.exception() is not None]
+                for task in failed[1:]:
+                    logger.warning("%s: page request failed", path, exc_info=task.exception())
+                if failed:
+                    raise failed[0].exception()
+
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def iter_pages(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        params: dict | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        params = {} if params is None else params
+        limiter = limiter or self.get_limiter()
+        total_count = await self.fetch_total_record_count(client, path, params.copy(), limiter)
+
+        if not total_count:
+            return
+
+        page_params = {**params, self._api_config.request_size: self._batch_size}
+        jobs = [(page, page_params) for page in range(1, ceil(total_count / self._batch_size) + 1)]
+        checkpoint = await self.get_checkpoint(path, params, jobs, total_count)
+
+        async for rows in self._run_pages(client, path, jobs, limiter, checkpoint):
+            yield rows
 
     async def fetch_paginated_data(
         self,
         client: httpx.AsyncClient,
         path: str,
         params: dict | None = None,
-        semaphore: asyncio.Semaphore = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
     ) -> list[dict]:
+        return [row async for rows in self.iter_pages(client, path, params, limiter) for row in rows]
+
+    async def stream_data(self, path: str, params: dict | None = None) -> AsyncIterator[list[dict]]:
+        await self.prepare()
+
         params = {} if params is None else params
-        total_count = await self.fetch_total_record_count(client, path, params)
+        limiter = self.get_limiter()
+        streamed = False
 
-        if not total_count:
-            return []
-
-        params[self._api_config.request_size] = self._batch_size
-        tasks = [
-            self._page_fetcher(
-                client,
-                path,
-                page,
-                params,
-                semaphore,
-            )
-            for page in range(1, ceil(total_count / self._batch_size) + 1)
-        ]
-        data = list(chain.from_iterable(await asyncio.gather(*tasks)))
+        async with self.session() as client:
+            async for rows in self.iter_pages(client, path, params, limiter):
+                streamed = True
+                yield rows
 
-        return data
+            if not streamed:
+                data = await self.fetch_with_retry(client, path, params, limiter)
+                yield data if isinstance(data, list) else [data]
+
+    async def stream_partitions(
+        self,
+        path: str,
+        partitions: list[str],
+        params: dict | None = None,
+        counts: dict[str, int] | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        파티션 값을 request_year 파라미터로 보내 파티션별로 페이지를 반환합니다.
+        """
+        await self.prepare()
+
+        params = {} if params is None else params
+        limiter = self.get_limiter()
+
+        async with self.session() as client:
+            for partition in partitions:
+                partition_params = {**params, self._api_config.request_year: partition}
+                async for rows in self.iter_pages(client, path, partition_params, limiter):
+                    yield rows
 
     async def get_data(self, path: str, params: dict | None = None) -> dict | list[dict]:
-        if self.swagger_url:
-            docs = await self.get_docs()
-            self.apply_docs(docs)
+        await self.prepare()
 
         params = {} if params is None else params
-        semaphore = asyncio.Semaphore(self._concurrency_limit)
+        limiter = self.get_limiter()
 
-        async with self.get_client() as client:
-            data = await self.fetch_paginated_data(client, path, params, semaphore)
-            return data if data else await self.fetch_data(client, path, params)
+        async with self.session() as client:
+            data = await self.fetch_paginated_data(client, path, params, limiter)
+            return data if data else await self.fetch_with_retry(client, path, params, limiter)
 
 
 class FiscalDataLoader(OpenDataLoader):
+    def __init__(
+        self,
+        *args,
+        years_back: int = 30,
+        years_ahead: int = 1,
+        planner: FetchPlanner | None = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            years_back (int): 올해 기준 과거 몇 년까지 불러올지
+            years_ahead (int): 올해 기준 미래 몇 년까지 불러올지
+            planner (FetchPlanner): 연도별 count 캐시와 요청 순서를 관리하는 planner
+        """
+        super().__init__(*args, **kwargs)
+        # 여러 path 가 같은 loader 로 동시에 갱신되므로 보고서는 path 별로 둡니다.
+        self.last_reports: dict[str, FetchReport] = {}
+        self._years_back = years_back
+        self._years_ahead = years_ahead
+        self._planner = planner or FetchPlanner()
+
+    def get_years(self) -> list[str]:
+        year = datetime.now().year
+        return [str(y) for y in range(year - self._years_back, year + self._years_ahead + 1)]
+
     async def fetch_total_record_count(
         self,
         client: httpx.AsyncClient,
         path: str,
         params: dict,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
     ) -> int:
         params[self._api_config.request_page] = 1
         params[self._api_config.request_size] = 1
 
+        data = await self.fetch_with_retry(client, path, params, limiter)
         try:
-            data = await self.fetch_data(client, path, params)
             return data[path][0]["head"][0]["list_total_count"]
-        except (KeyError, IndexError, ValueError, TypeError):
+        except (KeyError, IndexError, TypeError):
+            pass
+
+        # 데이터가 없는 연도는 head 없이 '데이터 없음' 결과 코드만 반환됩니다. 그 외의 응답은 0 으로 캐시되지 않도록 실패로 봅니다.
+        result = data.get(self._api_config.response_result) if isinstance(data, dict) else None
+        if isinstance(result, dict) and result.get(self._api_config.response_result_code) == (
+            self._api_config.response_empty_code
+        ):
             return 0
+        raise OpenDataRequestError(f"Unexpected count response for {path}: {result or data!r:.200}")
 
-    async def _page_fetcher(
+    def _extract_page(self, path: str, response: dict) -> list[dict]:
+        return response[path][1]["row"]
+
+    async def plan(
         self,
         client: httpx.AsyncClient,
         path: str,
-        page: int,
-        params: dict | None = None,
-        semaphore: asyncio.Semaphore = None,
-    ):
-        async with semaphore if semaphore else asyncio.Semaphore(self._concurrency_limit):
-            params[self._api_config.request_page] = page
-            response = await self.fetch_data(client, path, params)
-            return response[path][1]["row"]
+        params: dict,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        years: list[str] | None = None,
+    ) -> tuple[dict[str, int], FetchReport]:
+        """
+        캐시되지 않았거나 아직 변할 수 있는 연도에 대해서만 count 요청을 한 번에 보냅니다.
 
-    async def get_data(self, path: str, params: dict | None = None) -> dict | list[dict]:
-        if self.swagger_url:
-            docs = await self.get_docs()
-            self.apply_docs(docs)
+        Returns:
+            연도별 count, 이번 호출의 요청 수 보고서
+        """
+        years = years or self.get_years()
+        key = self._planner.get_key(path, params)
+        counts, probe_years = self._planner.split(key, years)
+
+        results = await asyncio.gather(
+            *(
+                self.fetch_total_record_count(client, path, {**params, self._api_config.request_year: year}, limiter)
+                for year in probe_years
+            ),
+            return_exceptions=True,
+        )
+        # 성공한 count 만 캐시하고, 실패한 연도가 있으면 갱신 전체를 실패시킵니다.
+        probed = {year: count for year, count in zip(probe_years, results) if not isinstance(count, BaseException)}
+        self._planner.update(key, probed)
+        errors = [error for error in results if isinstance(error, BaseException)]
+        if errors:
+            raise errors[0]
+
+        report = FetchReport(
+            years=len(years),
+            probed_years=len(probe_years),
+            cached_years=sum(1 for count in counts.values() if count),
+            skipped_years=sum(1 for count in counts.values() if not count),
+        )
+        return counts | probed, report
 
-        params = {} if params is None else params
-        semaphore = asyncio.Semaphore(self._concurrency_limit)
-        client = self.get_client()
+    def is_partition_settled(self, partition: str) -> bool:
+        return self._planner.is_settled(partition)
 
-        async def fetch(year):
-            _params = params.copy()
-            _params[self._api_config.request_year] = year
-            return await self.fetch_paginated_data(client, path, _params, semaphore)
+    async def get_partition_counts(self, path: str, params: dict | None = None) -> dict[str, int]:
+        await self.prepare()
 
-        tasks = [fetch(str(year)) for year in range(datetime.now().year - 30, datetime.now().year + 2)]
-        data = list(chain.from_iterable(await asyncio.gather(*tasks)))
+        async with self.session() as client:
+            counts, _ = await self.plan(client, path, {} if params is None else params)
+            return counts
 
-        await client.aclose()
-        return data
+    async def stream_partitions(
+        self,
+        path: str,
+        partitions: list[str],
+        params: dict | None = None,
+        counts: dict[str, int] | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        async for rows in self._stream_years(path, params, partitions, counts):
+            yield rows
+
+    async def stream_data(self, path: str, params: dict | None = None) -> AsyncIterator[list[dict]]:
+        async for rows in self._stream_years(path, params):
+            yield rows
+
+    async def _stream_years(
+        self,
+        path: str,
+        params: dict | None = None,
+        years: list[str] | None = None,
+        counts: dict[str, int] | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        await self.prepare()
+
+        params = {} if params is None else params
+        limiter = self.get_limiter()
+
+        async with self.session() as client:
+            if counts is not None and years is not None and all(year in counts for year in years):
+                # get_partition_counts 에서 이미 요청한 count 를 다시 요청하지 않습니다.
+                counts = {year: counts[year] for year in years}
+                report = FetchReport(
+                    years=len(years),
+                    cached_years=sum(1 for count in counts.values() if count),
+                    skipped_years=sum(1 for count in counts.values() if not count),
+                )
+            else:
+                counts, report = await self.plan(client, path, params, limiter, years)
+            schedule = self._planner.schedule(counts)
+            jobs = [
+                (page, {**params, self._api_config.request_year: year, self._api_config.request_size: self._batch_size})
+                for year, total_count in schedule
+                for page in range(1, ceil(total_count / self._batch_size) + 1)
+            ]
+            report.pages = len(jobs)
+            kind = "years" if years is None else f"partitions:{','.join(sorted(years))}"
+            checkpoint = await self.get_checkpoint(path, params, jobs, schedule, kind)
+
+            async for rows in self._run_pages(client, path, jobs, limiter, checkpoint):
+                yield rows
+
+        self.last_reports[path] = report
+        logger.info(
+            "%s: %d requests (%d count requests saved, %d empty years skipped)",
+            path,
+            report.requests,
+            report.saved_requests,
+            report.skipped_years,
+        )
+
+    async def get_data(self, path: str, params: dict | None = None) -> dict | list[dict]:
+        return [row async for rows in self.stream_data(path, params) for row in rows]
@@ -1,10 +1,28 @@
+import asyncio
+import hashlib
+import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime
 from typing import Any, Callable
 
 import polars as pl
+from redis.exceptions import LockError
+from webtool.cache import RedisCache
 
+from .checkpoint import get_hash
 from .data_loader import BaseOpenDataLoader
 from .data_saver import BaseDataSaver
+from .index import AggregateResult, BaseIndex, HashIndex, MaterializedAggregate, SortedIndex
+from .query import LRUCache, Query
+from .schema import Schema, cast, compact_schema, get_construct_schema
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 같은 프로세스의 PolarsDataManager 들이 같은 데이터를 동시에 내려받지 않도록 공유합니다.
+_downloads = SingleFlight()
 
 
 class BaseDataManager(ABC):
@@ -35,6 +53,61 @@ class BaseDataManager(ABC):
         pass
 
 
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    PolarsDataManager 가 한 시점에 제공하는 데이터와 파생 구조
+    갱신은 새 Snapshot 을 만든 뒤 참조만 교체하므로, 이전 Snapshot 을 잡고 있는 요청은 끝까지 같은 데이터를 봅니다.
+
+    Attributes:
+        data (pl.DataFrame): 데이터
+        version (int): 데이터 버전. 교체될 때마다 증가합니다.
+        fingerprints (dict[str, str]): 파티션별 fingerprint. 증분 갱신에서 비교한 파티션만 계산되어 있습니다.
+        indexes (dict[tuple[type, str], BaseIndex]): 인덱스
+        aggregates (dict[str, AggregateResult]): 미리 계산된 집계
+        cache_version (str | None): 데이터를 저장하거나 불러온 캐시의 버전
+        loaded_at (datetime): 데이터가 교체된 시각
+    """
+
+    data: pl.DataFrame = field(default_factory=pl.DataFrame)
+    version: int = 0
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    indexes: dict[tuple[type, str], BaseIndex] = field(default_factory=dict)
+    aggregates: dict[str, AggregateResult] = field(default_factory=dict)
+    cache_version: str | None = None
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    def lookup(self, column: str, value: Any) -> pl.DataFrame:
+        """
+        column 의 값이 value 인 row 를 반환합니다. HashIndex, SortedIndex 순으로 인덱스를 사용하며 없으면 전체를 검색합니다.
+        """
+        index = self.indexes.get((HashIndex, column)) or self.indexes.get((SortedIndex, column))
+        if index is None:
+            return self.data.filter(pl.col(column) == value)
+        return index.lookup(value)
+
+    def range(self, column: str, low: Any = None, high: Any = None) -> pl.DataFrame:
+        """
+        low <= column <= high 인 row 를 반환합니다. SortedIndex 가 없으면 전체를 검색합니다.
+        """
+        index = self.indexes.get((SortedIndex, column))
+        if index is not None:
+            return index.range(low, high)
+
+        data = self.data
+        if low is not None:
+            data = data.filter(pl.col(column) >= low)
+        if high is not None:
+            data = data.filter(pl.col(column) <= high)
+        return data
+
+    def aggregate(self, name: str) -> AggregateResult:
+        """
+        미리 계산된 집계를 반환합니다.
+        """
+        return self.aggregates[name]
+
+
 class PolarsDataManager(BaseDataManager):
     def __init__(
         self,
@@ -43,28 +116,329 @@ class PolarsDataManager(BaseDataManager):
         path: str,
         params: dict | None = None,
         infer_scheme_length: int = 100000,
+        partition_key: str | None = None,
+        query_cache_size: int = 256,
+        indexes: list[BaseIndex] | None = None,
+        aggregates: list[MaterializedAggregate] | None = None,
+        schema: Schema | None = None,
+        lock_cache: RedisCache | None = None,
+        lock_ttl_ms: int = 30 * 60 * 1000,
+        lock_wait_interval: float = 0.5,
     ):
-        self.data: pl.DataFrame = pl.DataFrame()
+        """
+        Args:
+            data_loader (BaseOpenDataLoader):
+            data_saver (BaseDataSaver):
+            path (str): API Endpoint
+            params (dict): API Query Params
+            infer_scheme_length (int):
+            partition_key (str): 증분 갱신에 사용할 파티션 컬럼 (예: FSCL_YY)
+            query_cache_size (int): 캐시할 query 결과의 수
+            indexes (list[BaseIndex]): 데이터를 불러올 때마다 만들 인덱스
+            aggregates (list[MaterializedAggregate]): 데이터를 불러올 때마다 미리 계산할 집계
+            schema (Schema): 컬럼 -> dtype. 선언되지 않은 컬럼은 처음 불러올 때 한 번만 추론하여 저장한 뒤,
+                이후에는 추론 없이 저장된 스키마로 데이터를 만듭니다.
+            lock_cache (RedisCache): 여러 프로세스가 같은 데이터를 동시에 내려받지 않도록 잠금에 사용할 캐시.
+                없으면 같은 프로세스 안에서만 다운로드를 합칩니다.
+            lock_ttl_ms (int): 다운로드 잠금 만료 (ms). 다운로드에 걸리는 최대 시간보다 길어야 합니다.
+            lock_wait_interval (float): 다른 프로세스의 다운로드를 기다릴 때 잠금을 확인하는 간격 (초)
+        """
+        self._snapshot = Snapshot()
+        self._refresh_lock = asyncio.Lock()
         self._data_loader = data_loader
         self._data_saver = data_saver
         self._path = path
         self._params = params or {}
         self._infer_scheme_length = infer_scheme_length
+        self._partition_key = partition_key
         self._callbacks: list[Callable] = []
+        self._query_cache = LRUCache(query_cache_size)
+        self._index_declarations = indexes or []
+        self._aggregate_declarations = aggregates or []
+        self._schema_declaration = schema or {}
+        self._schema: Schema | None = None
+        self._lock_cache = lock_cache
+        self._lock_ttl_ms = lock_ttl_ms
+        self._lock_wait_interval = lock_wait_interval
+
+        self.register_callback(self._query_cache.clear)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def data(self) -> pl.DataFrame:
+        return self._snapshot.data
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """
+        현재 Snapshot. 여러 번의 조회가 같은 데이터를 봐야 하는 경우 Snapshot 을 잡고 사용합니다.
+        """
+        return self._snapshot
+
+    async def init(self, reload: bool = False, incremental: bool = False):
+        """
+        새 Snapshot 을 만든 뒤 교체합니다. 교체 전까지 조회는 이전 Snapshot 으로 처리됩니다.
+
+        Parameters:
+            reload: 캐시를 무시하고 API 로부터 데이터를 다시 불러옵니다.
+            incremental: reload 시 변경된 파티션만 다시 불러옵니다. 파티션을 사용할 수 없으면 전체를 불러옵니다.
+        """
+        async with self._refresh_lock:
+            if reload and incremental and await self.refresh_partitions():
+                return
+
+            if not reload:
+                cache_version, data = await self._get_cache()
+            else:
+                cache_version, data = None, None
+
+            if data is None:
+                cache_version, data = await self._download(reload)
+
+            await self._set_data(data, {}, cache_version)
+
+    async def sync(self) -> bool:
+        """
+        다른 프로세스가 캐시를 갱신한 경우에만 캐시로부터 데이터를 다시 불러옵니다.
+
+        Returns:
+            데이터를 교체했는지 여부
+        """
+        async with self._refresh_lock:
+            cache_version = await self._data_saver.get_version(self._path)
+            if cache_version is None or cache_version == self._snapshot.cache_version:
+                return False
+
+            cache_version, data = await self._get_cache()
+            if data is None:
+                return False
+
+            await self._set_data(data, {}, cache_version)
+            return True
+
+    async def _download(self, reload: bool) -> tuple[str | None, pl.DataFrame]:
+        """
+        API 로부터 전체 데이터를 불러와 캐시에 저장합니다.
+        같은 프로세스의 동시 호출은 하나의 다운로드를 기다리고, 다른 프로세스가 다운로드 중이면 그 결과를 캐시에서 읽습니다.
+        """
+        key = get_hash([self._data_saver.key_prefix, self._path, self._params])
+        return await _downloads.do(key, lambda: self._download_once(key, reload))
 
-    async def init(self, reload: bool = False):
-        if not reload:
-            data = await self._data_saver.get_cache(self._path)
-        else:
-            data = None
+    async def _download_once(self, key: str, reload: bool) -> tuple[str | None, pl.DataFrame]:
+        if self._lock_cache is None:
+            return await self._fetch_and_cache()
 
-        if data is None:
-            data = await self._data_loader.get_data(self._path, self._params)
-            await self._data_saver.set_cache(self._path, data)
+        previous = await self._data_saver.get_version(self._path)
+        # token 을 확인하고 해제하는 redis-py 잠금을 사용하여, TTL 을 넘긴 다운로드가 다른 프로세스의 잠금을 풀지 않게 합니다.
+        lock = self._lock_cache.cache.lock(
+            f"download:{key}",
+            timeout=self._lock_ttl_ms / 1000,
+            sleep=self._lock_wait_interval,
+            blocking_timeout=self._lock_ttl_ms / 1000,
+        )
+        waited = not await lock.acquire(blocking=False)
 
-        self.data = pl.DataFrame(data, infer_schema_length=self._infer_scheme_length)
+        # 다른 프로세스가 다운로드 중입니다. 잠금이 풀리면 그 결과를 사용합니다.
+        if waited and not await lock.acquire():
+            return await self._fetch_and_cache()
+
+        try:
+            if waited:
+                cache_version, data = await self._get_cache()
+                if data is not None and (not reload or cache_version != previous):
+                    return cache_version, data
+
+            return await self._fetch_and_cache()
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("download %s outlived its lock (%d ms)", self._path, self._lock_ttl_ms)
+
+    async def _fetch_and_cache(self) -> tuple[str | None, pl.DataFrame]:
+        data = await self._read_pages(self._data_loader.stream_data(self._path, self._params))
+        return await self._set_cache(data), data
+
+    async def _get_cache(self) -> tuple[str | None, pl.DataFrame | None]:
+        cache_version = await self._data_saver.get_version(self._path)
+        return cache_version, await self._data_saver.get_cache(self._path)
+
+    async def _set_cache(self, data: pl.DataFrame) -> str | None:
+        return await self._data_saver.set_cache(self._path, data)
+
+    async def refresh_partitions(self) -> bool:
+        """
+        API 의 파티션별 row 수를 현재 데이터와 비교하여, 달라졌거나 아직 확정되지 않은 파티션만 다시 불러와 교체합니다.
+
+        Returns:
+            증분 갱신을 수행했는지 여부. False 인 경우 전체 갱신이 필요합니다.
+        """
+        snapshot = self._snapshot
+        if not self._partition_key or snapshot.data.is_empty() or self._partition_key not in snapshot.data.columns:
+            return False
+
+        counts = await self._data_loader.get_partition_counts(self._path, self._params)
+        if counts is None:
+            return False
+
+        current = self._get_partition_counts(snapshot.data)
+        removed = [partition for partition in current if partition not in counts]
+        targets = [
+            partition
+            for partition, count in counts.items()
+            if count != current.get(partition, 0) or (count and not self._data_loader.is_partition_settled(partition))
+        ]
+
+        fetched = snapshot.data.clear()
+        if targets:
+            fetched = await self._read_pages(
+                self._data_loader.stream_partitions(self._path, targets, self._params, counts)
+            )
+
+        # fingerprint 는 다시 불러온 파티션에 대해서만, event loop 밖에서 계산합니다.
+        previous = snapshot.fingerprints
+        missing = [partition for partition in targets if partition not in previous]
+        if missing:
+            current_data = snapshot.data.filter(self._partition_column().is_in(missing))
+            previous = previous | await asyncio.to_thread(self._get_fingerprints, current_data)
+        fingerprints = await asyncio.to_thread(self._get_fingerprints, fetched)
+        changed = removed + [
+            partition for partition in targets if fingerprints.get(partition) != previous.get(partition)
+        ]
+
+        if not changed:
+            # 데이터는 그대로이므로 계산한 fingerprint 만 남겨 다음 증분 갱신에서 다시 계산하지 않습니다.
+            self._snapshot = replace(snapshot, fingerprints=previous)
+            return True
+
+        fetched = fetched.filter(self._partition_column().is_in(changed))
+        data = pl.concat(
+            [snapshot.data.filter(~self._partition_column().is_in(changed)), fetched],
+            how="diagonal_relaxed",
+        )
+        fingerprints = {
+            partition: fingerprint
+            for partition, fingerprint in (previous | fingerprints).items()
+            if partition not in removed
+        }
+
+        cache_version = await self._set_cache(data)
+        await self._set_data(data, fingerprints, cache_version)
+        return True
+
+    async def query(self, query: Query) -> pl.DataFrame:
+        """
+        query 를 LazyFrame 으로 실행합니다. 결과는 데이터 버전별로 캐시되며 데이터가 교체되면 무효화됩니다.
+
+        Parameters:
+            query: 질의
+
+        Returns:
+            질의 결과
+        """
+        snapshot = self._snapshot
+        key = (snapshot.version, query.get_key())
+        result = self._query_cache.get(key)
+
+        if result is None:
+            result = await query.compile(snapshot.data.lazy()).collect_async()
+            if snapshot is self._snapshot:
+                self._query_cache.set(key, result)
+
+        return result
+
+    def lookup(self, column: str, value: Any) -> pl.DataFrame:
+        return self._snapshot.lookup(column, value)
+
+    def range(self, column: str, low: Any = None, high: Any = None) -> pl.DataFrame:
+        return self._snapshot.range(column, low, high)
+
+    def aggregate(self, name: str) -> AggregateResult:
+        return self._snapshot.aggregate(name)
+
+    def _build(self, data: pl.DataFrame) -> tuple[dict[tuple[type, str], BaseIndex], dict[str, AggregateResult]]:
+        indexes = {(type(index), index.column): index.build(data) for index in self._index_declarations}
+        aggregates = {aggregate.name: aggregate.build(data) for aggregate in self._aggregate_declarations}
+        return indexes, aggregates
+
+    async def _set_data(self, data: pl.DataFrame, fingerprints: dict[str, str], cache_version: str | None = None):
+        indexes, aggregates = {}, {}
+        if self._index_declarations or self._aggregate_declarations:
+            indexes, aggregates = await asyncio.to_thread(self._build, data)
+
+        self._snapshot = Snapshot(
+            data=data,
+            version=self._snapshot.version + 1,
+            fingerprints=fingerprints,
+            indexes=indexes,
+            aggregates=aggregates,
+            cache_version=cache_version,
+        )
         self._notify_callbacks()
 
+    def _partition_column(self) -> pl.Expr:
+        return pl.col(self._partition_key).cast(pl.Utf8)
+
+    def _get_partition_counts(self, data: pl.DataFrame) -> dict[str, int]:
+        counts = data.group_by(self._partition_column()).len()
+        return dict(zip(*counts.get_columns()))
+
+    def _get_fingerprints(self, data: pl.DataFrame) -> dict[str, str]:
+        """
+        파티션별 내용의 blake2b. row 를 컬럼 이름 순서의 JSON 으로 바꾸어 정렬한 뒤 hash 하므로,
+        row/컬럼 순서, dtype 의 폭 (Int32/Int64 등), polars 버전과 무관하게 내용이 같으면 같은 값을 가집니다.
+        """
+        if not self._partition_key or self._partition_key not in data.columns:
+            return {}
+
+        rows = (
+            data.select(self._partition_column(), pl.struct(sorted(data.columns)).struct.json_encode().alias("row"))
+            .group_by(self._partition_key)
+            .agg(pl.col("row").sort())
+        )
+        return {
+            partition: hashlib.blake2b("\n".join(values).encode(), digest_size=16).hexdigest()
+            for partition, values in rows.iter_rows()
+        }
+
+    async def _get_schema(self) -> Schema | None:
+        if self._schema is None:
+            schema = await self._data_saver.get_schema(self._path)
+            self._schema = schema | self._schema_declaration if schema else None
+        return self._schema
+
+    async def _read_pages(self, pages: AsyncIterator[list[dict]]) -> pl.DataFrame:
+        """
+        페이지를 받는 즉시 DataFrame 으로 변환하여, row dict 는 페이지 단위로만 메모리에 유지합니다.
+        저장된 스키마가 있으면 타입 추론 없이 만들고, 없으면 추론한 결과로 작은 dtype 의 스키마를 만들어 저장합니다.
+        """
+        schema = await self._get_schema()
+        construct_schema = get_construct_schema(schema or self._schema_declaration)
+
+        frames = [self._to_frame(rows, construct_schema, complete=schema is not None) async for rows in pages if rows]
+        data = pl.concat(frames, how="diagonal_relaxed") if frames else pl.DataFrame()
+
+        if schema is not None or data.is_empty():
+            return cast(data, schema or self._schema_declaration)
+
+        hints = self._data_loader.get_schema(self._path) | self._schema_declaration
+        data = cast(data, compact_schema(data, hints))
+        self._schema = dict(data.schema)
+        await self._data_saver.set_schema(self._path, self._schema)
+        return data
+
+    def _to_frame(self, rows: list[dict], schema: Schema, complete: bool) -> pl.DataFrame:
+        if complete and rows[0].keys() <= schema.keys():
+            return pl.DataFrame(rows, schema=schema, strict=False)
+        return pl.DataFrame(rows, schema_overrides=schema, infer_schema_length=self._infer_scheme_length, strict=False)
+
     def _notify_callbacks(self):
         [callback() for callback in self._callbacks]
 
@@ -1,9 +1,37 @@
-import gzip
+import asyncio
+import fcntl
+import hashlib
 import json
+import logging
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from itertools import chain
+from math import ceil
+from pathlib import Path
+from uuid import uuid4
 
+import polars as pl
 from webtool.cache import RedisCache
 
+from .codec import (
+    BaseCodec,
+    CodecMetrics,
+    GzipJsonCodec,
+    IpcCodec,
+    ParquetCodec,
+    get_codec,
+    timed_decode,
+    timed_encode,
+)
+from .schema import Schema, dumps_schema, loads_schema
+
+logger = logging.getLogger(__name__)
+
 
 class BaseDataSaver(ABC):
     """
@@ -12,13 +40,23 @@ class BaseDataSaver(ABC):
     Attributes:
         key_prefix (str): 키 전치사
         expire (int): 만료 (초)
+        codec (BaseCodec): 저장에 사용하는 codec
+        codecs (list[BaseCodec]): 불러올 때 포맷을 판별하는 데 사용하는 codec 목록
     """
 
     key_prefix: str
     expire: int
+    codec: BaseCodec
+    codecs: list[BaseCodec]
+
+    def encode(self, value: pl.DataFrame) -> bytes:
+        return self.codec.encode(value)
+
+    def decode(self, value: bytes) -> pl.DataFrame:
+        return get_codec(value, self.codecs).decode(value)
 
     @abstractmethod
-    async def get_cache(self, key: str) -> dict | None:
+    async def get_cache(self, key: str) -> pl.DataFrame | None:
         """
         캐시로부터 데이터를 불러옵니다.
 
@@ -28,36 +66,373 @@ class BaseDataSaver(ABC):
         pass
 
     @abstractmethod
-    async def set_cache(self, key: str, value: dict) -> None:
+    async def set_cache(self, key: str, value: pl.DataFrame) -> str | None:
         """
         캐시에 대이터를 저장합니다.
 
         Parameters:
             key (str): Cache Key
-            value (dict): Cache Value
+            value (pl.DataFrame): Cache Value
+
+        Returns:
+            저장한 데이터의 버전. 버전을 지원하지 않으면 None
         """
         pass
 
+    async def get_version(self, key: str) -> str | None:
+        """
+        저장된 데이터의 버전을 반환합니다. 데이터를 불러오지 않고 변경 여부를 확인하는 데 사용됩니다.
+
+        Parameters:
+            key (str): Cache Key
+
+        Returns:
+            데이터의 버전. 버전을 지원하지 않거나 데이터가 없으면 None
+        """
+        return None
+
+    async def get_metadata(self, key: str) -> dict | None:
+        """
+        데이터와 함께 사용하는 작은 JSON 값(예: API 문서)을 불러옵니다.
+
+        Parameters:
+            key (str): Cache Key
+        """
+        return None
+
+    async def set_metadata(self, key: str, value: dict) -> None:
+        """
+        Parameters:
+            key (str): Cache Key
+            value (dict): JSON 으로 저장할 값
+        """
+        return None
+
+    async def get_schema(self, key: str) -> Schema | None:
+        """
+        데이터를 처음 불러올 때 저장한 스키마를 반환합니다.
+
+        Parameters:
+            key (str): Cache Key
+        """
+        return None
+
+    async def set_schema(self, key: str, schema: Schema) -> None:
+        """
+        Parameters:
+            key (str): Cache Key
+            schema (Schema): 컬럼 -> dtype
+        """
+        return None
+
 
 class RedisDataSaver(BaseDataSaver):
-    def __init__(self, cache: RedisCache, expire: int = 31536000, key_prefix: str = ""):
+    """
+    데이터를 row 범위로 나눈 청크 키와, 현재 버전의 청크 목록을 가리키는 manifest 키로 저장합니다.
+    청크를 모두 쓴 뒤 manifest 를 교체하므로 읽는 쪽은 항상 완성된 버전만 보게 됩니다.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        expire: int = 31536000,
+        key_prefix: str = "",
+        codec: BaseCodec | None = None,
+        chunk_size: int = 8 * 1024 * 1024,
+        pipeline_size: int = 8,
+        stale_chunk_expire: int = 60,
+        pending_chunk_expire: int = 600,
+        executor: Executor | None = None,
+    ):
+        """
+        Args:
+            cache (RedisCache):
+            expire (int): 만료 (초)
+            key_prefix (str): 키 전치사
+            codec (BaseCodec): 저장에 사용하는 codec. 기본값은 zstd 로 압축한 Arrow IPC 입니다.
+            chunk_size (int): 청크 하나에 담을 데이터의 크기 (압축 전, bytes)
+            pipeline_size (int): 파이프라인 한 번에 주고받는 청크 수
+            stale_chunk_expire (int): 교체된 이전 버전 청크를 읽는 중인 요청을 위해 남겨두는 시간 (초)
+            pending_chunk_expire (int): manifest 를 쓰기 전까지 청크에 두는 만료 (초). 저장이 중간에 실패해도
+                남은 청크가 이 시간 뒤에 사라집니다. 전체 청크를 쓰는 데 걸리는 시간보다 길어야 합니다.
+            executor (Executor): 인코딩/디코딩을 실행할 executor. ProcessPoolExecutor 도 사용할 수 있으며,
+                None 이면 event loop 의 기본 thread pool 을 사용합니다.
+        """
         self.expire = expire
         self.key_prefix = key_prefix
         self.cache = cache
+        self.codec = codec or IpcCodec()
+        self.codecs = [self.codec, IpcCodec(), ParquetCodec(), GzipJsonCodec()]
+        self._chunk_size = chunk_size
+        self._pipeline_size = pipeline_size
+        self._stale_chunk_expire = stale_chunk_expire
+        self._pending_chunk_expire = pending_chunk_expire
+        self._executor = executor
+        self.last_get_metrics = CodecMetrics()
+        self.last_set_metrics = CodecMetrics()
 
     def get_cache_key(self, key: str | None) -> str:
         return f"{self.key_prefix}{key if key else ''}"
 
-    async def get_cache(self, key: str) -> dict | None:
-        cache_key = self.get_cache_key(key)
-        serialized_data = await self.cache.get(cache_key)
+    @staticmethod
+    def get_chunk_keys(cache_key: str, manifest: dict) -> list[str]:
+        return [f"{cache_key}:{manifest['version']}:{index}" for index in range(manifest["chunks"])]
+
+    async def get_manifest(self, key: str) -> dict | None:
+        value = await self.cache.get(self.get_cache_key(key))
+        return self._parse_manifest(value)
 
-        if serialized_data:
-            return json.loads(gzip.decompress(serialized_data))
+    async def get_version(self, key: str) -> str | None:
+        manifest = await self.get_manifest(key)
+        return manifest["version"] if manifest else None
+
+    async def get_metadata(self, key: str) -> dict | None:
+        value = await self.cache.get(self.get_cache_key(key))
+        return json.loads(value) if value else None
+
+    async def set_metadata(self, key: str, value: dict) -> None:
+        await self.cache.set(self.get_cache_key(key), json.dumps(value), ex=self.expire)
+
+    async def get_schema(self, key: str) -> Schema | None:
+        value = await self.cache.get(f"{self.get_cache_key(key)}:schema")
+        return loads_schema(value) if value else None
+
+    async def set_schema(self, key: str, schema: Schema) -> None:
+        await self.cache.set(f"{self.get_cache_key(key)}:schema", dumps_schema(schema), ex=self.expire)
+
+    @staticmethod
+    def _parse_manifest(value: bytes | None) -> dict | None:
+        if value and value[:1] == b"{":
+            return json.loads(value)
         return None
 
-    async def set_cache(self, key: str, value: dict) -> None:
+    async def _run(self, func: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _decode(self, values: list[bytes]) -> tuple[pl.DataFrame, CodecMetrics]:
+        results = await asyncio.gather(*(self._run(timed_decode, self.codecs, value) for value in values))
+        frames = [frame for frame, _ in results]
+        metrics = sum((metrics for _, metrics in results), CodecMetrics())
+        return pl.concat(frames, rechunk=False), metrics
+
+    def _split(self, value: pl.DataFrame) -> list[pl.DataFrame]:
+        chunks = max(ceil(value.estimated_size() / self._chunk_size), 1)
+        rows = max(ceil(value.height / chunks), 1)
+        return [value.slice(offset, rows) for offset in range(0, max(value.height, 1), rows)]
+
+    async def get_cache(self, key: str) -> pl.DataFrame | None:
+        _, data = await self.get_versioned_cache(key)
+        return data
+
+    async def get_versioned_cache(self, key: str) -> tuple[str | None, pl.DataFrame | None]:
+        """
+        Returns:
+            데이터의 버전, 데이터. 청크로 저장되지 않은 이전 포맷의 값은 버전이 None 입니다.
+        """
+        cache_key = self.get_cache_key(key)
+        start = time.perf_counter()
+
+        # 청크를 읽는 사이 manifest 가 교체되어 이전 버전 청크가 만료된 경우 한 번 더 시도합니다.
+        for _ in range(2):
+            serialized_data = await self.cache.get(cache_key)
+
+            if not serialized_data:
+                return None, None
+
+            manifest = self._parse_manifest(serialized_data)
+            chunks = (
+                [serialized_data]
+                if manifest is None
+                else await self._get_chunks(self.get_chunk_keys(cache_key, manifest))
+            )
+            if chunks is not None:
+                break
+        else:
+            return None, None
+
+        network = CodecMetrics(network=time.perf_counter() - start, size=sum(len(chunk) for chunk in chunks))
+        data, metrics = await self._decode(chunks)
+        self.last_get_metrics = metrics + network
+        logger.debug("get %s: %s", cache_key, self.last_get_metrics)
+
+        return manifest["version"] if manifest else None, data
+
+    async def _get_chunks(self, chunk_keys: list[str]) -> list[bytes] | None:
+        async def fetch(keys: list[str]) -> list[bytes | None]:
+            return await self.cache.cache.mget(keys)
+
+        batches = [chunk_keys[i : i + self._pipeline_size] for i in range(0, len(chunk_keys), self._pipeline_size)]
+        chunks = list(chain.from_iterable(await asyncio.gather(*(fetch(batch) for batch in batches))))
+
+        if any(chunk is None for chunk in chunks):
+            return None
+        return chunks
+
+    async def _set_chunks(self, chunk_keys: list[str], chunks: list[bytes]) -> float:
+        start = time.perf_counter()
+
+        async with self.cache.cache.pipeline(transaction=False) as pipe:
+            for chunk_key, chunk in zip(chunk_keys, chunks):
+                pipe.set(chunk_key, chunk, ex=self._pending_chunk_expire)
+            await pipe.execute()
+
+        return time.perf_counter() - start
+
+    async def set_cache(self, key: str, value: pl.DataFrame) -> str:
         cache_key = self.get_cache_key(key)
+        metrics = CodecMetrics()
+        start = time.perf_counter()
+        previous = await self.get_manifest(key)
+        metrics.network += time.perf_counter() - start
+
+        frames = self._split(value)
+        manifest = {"version": uuid4().hex, "chunks": len(frames), "rows": value.height}
+        chunk_keys = self.get_chunk_keys(cache_key, manifest)
+        writing: asyncio.Task | None = None
+
+        try:
+            # 다음 배치를 인코딩하는 동안 이전 배치를 전송합니다.
+            for offset in range(0, len(frames), self._pipeline_size):
+                batch = frames[offset : offset + self._pipeline_size]
+                results = await asyncio.gather(*(self._run(timed_encode, self.codec, frame) for frame in batch))
+                metrics = sum((result for _, result in results), metrics)
+
+                if writing:
+                    metrics.network += await writing
+                writing = asyncio.create_task(self._set_chunks(chunk_keys[offset:], [chunk for chunk, _ in results]))
+
+            if writing:
+                metrics.network += await writing
+                writing = None
+
+            # manifest 와 청크의 만료 연장을 한 트랜잭션으로 보내, manifest 가 가리키는 청크는 항상 함께 유지됩니다.
+            start = time.perf_counter()
+            async with self.cache.cache.pipeline(transaction=True) as pipe:
+                pipe.set(cache_key, json.dumps(manifest), ex=self.expire)
+                for chunk_key in chunk_keys:
+                    pipe.expire(chunk_key, self.expire)
+                await pipe.execute()
+        except BaseException:
+            if writing:
+                writing.cancel()
+            try:
+                await self.cache.cache.unlink(*chunk_keys)
+            except Exception:
+                logger.warning("failed to clean up chunks of %s", cache_key, exc_info=True)
+            raise
+
+        if previous:
+            async with self.cache.cache.pipeline(transaction=False) as pipe:
+                for chunk_key in self.get_chunk_keys(cache_key, previous):
+                    pipe.expire(chunk_key, self._stale_chunk_expire)
+                await pipe.execute()
+
+        metrics.network += time.perf_counter() - start
+        self.last_set_metrics = metrics
+        logger.debug("set %s: %s", cache_key, metrics)
+        return manifest["version"]
+
+
+class TieredDataSaver(BaseDataSaver):
+    """
+    RedisDataSaver 앞에 로컬 Arrow IPC 파일 계층을 두는 클래스
+    파일은 압축 없이 저장되어 memory map 으로 읽히므로, 같은 호스트의 worker 들이 page cache 를 공유합니다.
+    파일 이름에 Redis manifest 의 버전이 포함되어, 버전이 바뀌면 새 파일을 한 번만 내려받습니다.
+    """
+
+    def __init__(self, remote: RedisDataSaver, directory: str | Path | None = None):
+        """
+        Args:
+            remote (RedisDataSaver): 버전과 원본 데이터를 가진 저장소
+            directory (str | Path): 로컬 파일을 저장할 디렉토리
+        """
+        self.remote = remote
+        self.expire = remote.expire
+        self.key_prefix = remote.key_prefix
+        self.codec = remote.codec
+        self.codecs = remote.codecs
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / "openapi-cache")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_name(self, key: str) -> str:
+        return hashlib.sha256(self.remote.get_cache_key(key).encode()).hexdigest()[:32]
+
+    def get_path(self, key: str, version: str) -> Path:
+        return self.directory / f"{self.get_name(key)}.{version}.arrow"
+
+    @asynccontextmanager
+    async def _lock(self, key: str):
+        """
+        같은 호스트의 다른 프로세스가 동시에 같은 데이터를 내려받지 않도록 파일 잠금을 겁니다.
+        """
+        with open(self.directory / f"{self.get_name(key)}.lock", "wb") as file:
+            await asyncio.to_thread(fcntl.flock, file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _read(self, path: Path) -> pl.DataFrame | None:
+        """
+        파일의 record batch 를 그대로 memory map 하여, 여러 worker 가 같은 page cache 를 공유합니다.
+        다른 프로세스가 새 버전을 쓰면서 파일을 지운 경우 None 을 반환합니다.
+        """
+        try:
+            return pl.read_ipc(path, memory_map=True, rechunk=False)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, version: str, value: pl.DataFrame) -> None:
+        path = self.get_path(key, version)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        value.write_ipc(temp_path, compression="uncompressed")
+        os.replace(temp_path, path)
+
+        # 이미 memory map 으로 열린 이전 버전 파일은 unlink 후에도 닫힐 때까지 유효합니다.
+        for stale_path in self.directory.glob(f"{self.get_name(key)}.*.arrow"):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+
+    async def get_version(self, key: str) -> str | None:
+        return await self.remote.get_version(key)
+
+    async def get_metadata(self, key: str) -> dict | None:
+        return await self.remote.get_metadata(key)
+
+    async def set_metadata(self, key: str, value: dict) -> None:
+        await self.remote.set_metadata(key, value)
+
+    async def get_schema(self, key: str) -> Schema | None:
+        return await self.remote.get_schema(key)
+
+    async def set_schema(self, key: str, schema: Schema) -> None:
+        await self.remote.set_schema(key, schema)
+
+    async def get_cache(self, key: str) -> pl.DataFrame | None:
+        manifest = await self.remote.get_manifest(key)
+        if manifest is None:
+            return await self.remote.get_cache(key)
+
+        path = self.get_path(key, manifest["version"])
+        if (data := self._read(path)) is not None:
+            return data
+
+        async with self._lock(key):
+            if (data := self._read(path)) is not None:
+                return data
+
+            version, data = await self.remote.get_versioned_cache(key)
+            if version is None:
+                return data
+
+            await asyncio.to_thread(self._write, key, version, data)
+            mapped = self._read(self.get_path(key, version))
+            return data if mapped is None else mapped
 
-        serialized_data = gzip.compress(json.dumps(value).encode())
-        await self.cache.set(cache_key, serialized_data, ex=self.expire)
+    async def set_cache(self, key: str, value: pl.DataFrame) -> str:
+        # 저장 후 manifest 를 다시 읽으면 그 사이 다른 writer 가 저장한 버전에 이 데이터를 쓸 수 있으므로,
+        # 직접 저장한 버전을 사용합니다.
+        version = await self.remote.set_cache(key, value)
+        async with self._lock(key):
+            await asyncio.to_thread(self._write, key, version, value)
+        return version
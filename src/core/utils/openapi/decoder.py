@@ -0,0 +1,58 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class BaseDecoder(ABC):
+    """
+    API 응답 본문(bytes)을 파이썬 객체로 변환하는 클래스
+    일부 API 는 JSON 문자열을 한 번 더 JSON 으로 인코딩하여 응답하므로, 결과가 문자열이면 한 번 더 디코딩합니다.
+    """
+
+    @abstractmethod
+    def loads(self, content: bytes | str) -> Any:
+        pass
+
+    def decode(self, content: bytes) -> Any:
+        """
+        Parameters:
+            content (bytes): 응답 본문
+
+        Returns:
+            디코딩된 값
+
+        Raises:
+            ValueError: JSON 이 아닌 경우
+        """
+        data = self.loads(content)
+        return self.loads(data) if isinstance(data, str) else data
+
+
+class JsonDecoder(BaseDecoder):
+    def loads(self, content: bytes | str) -> Any:
+        return json.loads(content)
+
+
+class OrjsonDecoder(BaseDecoder):
+    """
+    bytes 를 str 로 변환하지 않고 바로 디코딩합니다.
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is required for OrjsonDecoder.")
+
+    def loads(self, content: bytes | str) -> Any:
+        return orjson.loads(content)
+
+
+def get_default_decoder() -> BaseDecoder:
+    """
+    orjson 이 설치되어 있으면 OrjsonDecoder, 없으면 JsonDecoder 를 반환합니다.
+    """
+    return OrjsonDecoder() if orjson is not None else JsonDecoder()
@@ -0,0 +1,179 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+import polars as pl
+
+from .query import Aggregation, Query
+
+
+class BaseIndex(ABC):
+    """
+    PolarsDataManager 의 데이터에 대한 인덱스
+    선언된 인덱스는 데이터가 교체될 때마다 build 로 새 인덱스를 만들어 교체됩니다.
+
+    Attributes:
+        column (str): 인덱스 컬럼
+    """
+
+    column: str
+
+    def __init__(self, column: str):
+        self.column = column
+
+    @abstractmethod
+    def build(self, data: pl.DataFrame) -> "BaseIndex":
+        """
+        Parameters:
+            data (pl.DataFrame): 인덱스를 만들 데이터
+
+        Returns:
+            data 로 만든 새 인덱스
+        """
+        pass
+
+    @abstractmethod
+    def lookup(self, value: Any) -> pl.DataFrame:
+        """
+        column 의 값이 value 인 row 를 반환합니다.
+        """
+        pass
+
+
+def _sort_rows(data: pl.DataFrame, column: str) -> tuple[pl.Series, pl.Series]:
+    """
+    Categorical 컬럼은 search_sorted 가 문자열 값을 받을 수 있도록 문자열로 바꾸어 정렬합니다.
+
+    Returns:
+        정렬된 column 값, 정렬된 순서의 row 번호. 데이터 자체는 복사하지 않습니다.
+    """
+    keys = data.get_column(column)
+    if keys.dtype == pl.Categorical:
+        keys = keys.cast(pl.Utf8)
+    rows = keys.arg_sort(nulls_last=True)
+    return keys.gather(rows), rows
+
+
+class SortedIndex(BaseIndex):
+    """
+    정렬된 column 값과 row 번호 (arg_sort) 에 이진 탐색을 하는 인덱스. 점 조회와 범위 조회가 O(log n) 입니다.
+    데이터는 복사하지 않고 원본을 참조하므로, 인덱스마다 column 하나와 row 번호만큼의 메모리를 사용합니다.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        data: pl.DataFrame | None = None,
+        keys: pl.Series | None = None,
+        rows: pl.Series | None = None,
+    ):
+        super().__init__(column)
+        self._data = data
+        self._keys = keys
+        self._rows = rows
+
+    def build(self, data: pl.DataFrame) -> "SortedIndex":
+        keys, rows = _sort_rows(data, self.column)
+        return SortedIndex(self.column, data, keys, rows)
+
+    def _search(self, value: Any, side: str) -> int:
+        return int(self._keys.search_sorted(value, side=side))
+
+    def _gather(self, start: int, end: int) -> pl.DataFrame:
+        return self._data[self._rows.slice(start, max(end - start, 0))]
+
+    def lookup(self, value: Any) -> pl.DataFrame:
+        """
+        value 가 None 이면 column 이 null 인 row 를 반환합니다.
+        """
+        if value is None:
+            return self._gather(self._keys.len() - self._keys.null_count(), self._keys.len())
+        return self.range(value, value)
+
+    def range(self, low: Any = None, high: Any = None) -> pl.DataFrame:
+        """
+        low <= column <= high 인 row 를 반환합니다. None 인 경계는 열려 있으며, null 인 row 는 포함하지 않습니다.
+        """
+        start = 0 if low is None else self._search(low, "left")
+        end = self._keys.len() - self._keys.null_count() if high is None else self._search(high, "right")
+        return self._gather(start, end)
+
+
+class HashIndex(BaseIndex):
+    """
+    column 의 값 -> 정렬된 row 번호의 범위 해시 맵. 점 조회가 O(1) 입니다.
+    데이터는 복사하지 않고 원본과 row 번호만 가집니다.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        data: pl.DataFrame | None = None,
+        rows: pl.Series | None = None,
+        ranges: dict[Any, tuple[int, int]] | None = None,
+    ):
+        super().__init__(column)
+        self._data = data
+        self._rows = rows
+        self._ranges = ranges or {}
+
+    def build(self, data: pl.DataFrame) -> "HashIndex":
+        keys, rows = _sort_rows(data, self.column)
+        ranges = (
+            keys.to_frame()
+            .with_row_index("offset")
+            .group_by(self.column, maintain_order=True)
+            .agg(pl.col("offset").first(), pl.len().alias("length"))
+        )
+        return HashIndex(
+            self.column,
+            data,
+            rows,
+            {key: (offset, length) for key, offset, length in ranges.iter_rows()},
+        )
+
+    def lookup(self, value: Any) -> pl.DataFrame:
+        offset, length = self._ranges.get(value, (0, 0))
+        return self._data[self._rows.slice(offset, length)]
+
+    def keys(self) -> list:
+        return list(self._ranges)
+
+
+@dataclass(frozen=True)
+class MaterializedAggregate:
+    """
+    데이터가 교체될 때마다 미리 계산해 두는 집계
+
+    Attributes:
+        name (str): 집계 이름
+        group_by (tuple[str, ...]): 그룹 컬럼
+        aggregations (tuple[Aggregation, ...]): 집계
+    """
+
+    name: str
+    group_by: tuple[str, ...]
+    aggregations: tuple[Aggregation, ...]
+
+    def build(self, data: pl.DataFrame) -> "AggregateResult":
+        result = Query(group_by=self.group_by, aggregations=self.aggregations).compile(data.lazy()).collect()
+        return AggregateResult(
+            result,
+            {row[: len(self.group_by)]: row for row in result.iter_rows()},
+        )
+
+
+@dataclass(frozen=True)
+class AggregateResult:
+    """
+    Attributes:
+        data (pl.DataFrame): 집계 결과
+        rows (dict[tuple, tuple]): 그룹 키 -> 집계 row
+    """
+
+    data: pl.DataFrame
+    rows: dict[tuple, tuple]
+
+    def get(self, *keys: Any) -> dict | None:
+        row = self.rows.get(keys)
+        return dict(zip(self.data.columns, row)) if row is not None else None
@@ -0,0 +1,182 @@
+import asyncio
+import random
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class OpenDataRequestError(ValueError):
+    """
+    Open API 요청 실패
+
+    Attributes:
+        status_code (int | None): HTTP 상태 코드. 네트워크 오류인 경우 None
+        retry_after (float | None): 응답의 Retry-After (초)
+    """
+
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class OpenDataConfigError(ValueError):
+    """
+    API 문서와 맞지 않는 요청 (없는 path, 필수 파라미터 누락 등). 설정 오류이므로 재시도하거나 빈 데이터로 보지 않습니다.
+    """
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Retry-After 헤더(초 또는 HTTP-date)를 초 단위로 변환합니다.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    페이지 단위 재시도 정책 (Full Jitter Exponential Backoff)
+
+    Attributes:
+        max_retries (int): 최대 재시도 횟수
+        base_delay (float): 첫 재시도의 최대 대기 시간 (초)
+        max_delay (float): 대기 시간 상한 (초)
+        retry_statuses (frozenset[int]): 재시도할 HTTP 상태 코드
+        throttle_statuses (frozenset[int]): 동시성을 줄여야 하는 HTTP 상태 코드
+    """
+
+    max_retries: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+    throttle_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 503}))
+
+    def is_retryable(self, error: OpenDataRequestError) -> bool:
+        return error.status_code is None or error.status_code in self.retry_statuses
+
+    def is_throttled(self, error: OpenDataRequestError) -> bool:
+        return error.status_code in self.throttle_statuses
+
+    def get_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD(Additive Increase, Multiplicative Decrease) 방식으로 동시 요청 수를 조절하는 리미터
+    asyncio.Semaphore 와 같이 async with 로 사용합니다.
+
+    Attributes:
+        limit (int): 현재 동시 요청 상한
+        in_flight (int): 현재 진행 중인 요청 수
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        """
+        Args:
+            initial_limit (int): 시작 동시 요청 상한
+            min_limit (int): 동시 요청 하한
+            max_limit (int): 동시 요청 상한
+            increase (float): 상한만큼의 요청이 성공할 때마다 증가시키는 값
+            decrease_factor (float): 제한 응답을 받았을 때 상한에 곱하는 값
+            decrease_cooldown (float): 연속된 제한 응답으로 상한이 중복 감소하지 않도록 하는 간격 (초)
+        """
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._decrease_factor = decrease_factor
+        self._decrease_cooldown = decrease_cooldown
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # 깨워진 뒤에 취소되었다면 받은 차례를 다음 대기자에게 넘깁니다.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """
+        await 없이 바로 반환하므로 취소되는 중에도 슬롯이 새지 않습니다.
+        """
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        for waiter in self._waiters:
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        limit = self.limit
+        self._limit = min(self._limit + self._increase / self._limit, self._max_limit)
+        if self.limit > limit:
+            self._wake()
+
+    def on_throttle(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if now - self._last_decrease < self._decrease_cooldown:
+            return
+
+        self._last_decrease = now
+        self._limit = max(self._limit * self._decrease_factor, self._min_limit)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,74 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class FetchReport:
+    """
+    한 번의 갱신에서 발생한 요청 수 보고서
+
+    Attributes:
+        years (int): 대상 연도 수
+        probed_years (int): count 요청을 보낸 연도 수
+        cached_years (int): 캐시된 count 를 재사용한 연도 수
+        skipped_years (int): 비어 있는 것으로 알려져 건너뛴 연도 수
+        pages (int): 페이지 요청 수
+    """
+
+    years: int = 0
+    probed_years: int = 0
+    cached_years: int = 0
+    skipped_years: int = 0
+    pages: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.probed_years + self.pages
+
+    @property
+    def saved_requests(self) -> int:
+        return self.years - self.probed_years
+
+
+class FetchPlanner:
+    """
+    연도별 list_total_count 를 캐시하여 FiscalDataLoader 의 요청 계획을 세우는 클래스
+    settled_years 보다 오래된 연도는 더 이상 변하지 않는 것으로 보고 캐시된 count 를 그대로 사용합니다.
+    """
+
+    def __init__(self, settled_years: int = 2):
+        self._settled_years = settled_years
+        self._counts: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def get_key(path: str, params: dict) -> str:
+        return json.dumps([path, params], sort_keys=True, default=str)
+
+    def is_settled(self, year: str) -> bool:
+        return int(year) < datetime.now().year - self._settled_years
+
+    def split(self, key: str, years: list[str]) -> tuple[dict[str, int], list[str]]:
+        """
+        Returns:
+            캐시된 연도별 count, count 요청이 필요한 연도 목록
+        """
+        cached = self._counts.get(key, {})
+        counts = {year: cached[year] for year in years if year in cached and self.is_settled(year)}
+        return counts, [year for year in years if year not in counts]
+
+    def update(self, key: str, counts: dict[str, int]) -> None:
+        self._counts.setdefault(key, {}).update(counts)
+
+    def invalidate(self, key: str | None = None) -> None:
+        if key is None:
+            self._counts.clear()
+        else:
+            self._counts.pop(key, None)
+
+    @staticmethod
+    def schedule(counts: dict[str, int]) -> list[tuple[str, int]]:
+        """
+        데이터가 많은 연도부터 요청하도록 비어 있지 않은 연도를 count 내림차순으로 정렬합니다.
+        """
+        return sorted(((year, count) for year, count in counts.items() if count), key=lambda x: x[1], reverse=True)
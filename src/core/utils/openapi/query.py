@@ -0,0 +1,153 @@
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Literal
+
+import polars as pl
+
+FilterOp = Literal["eq", "ne", "lt", "le", "gt", "ge", "in", "not_in", "between", "contains", "is_null", "not_null"]
+AggregationFunc = Literal["sum", "mean", "median", "min", "max", "count", "n_unique", "first", "last"]
+
+_FILTER_OPS: dict[str, Callable[[pl.Expr, Any], pl.Expr]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "le": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "ge": lambda column, value: column >= value,
+    "in": lambda column, value: column.is_in(list(value)),
+    "not_in": lambda column, value: ~column.is_in(list(value)),
+    "between": lambda column, value: column.is_between(*value),
+    "contains": lambda column, value: column.str.contains(value, literal=True),
+    "is_null": lambda column, _: column.is_null(),
+    "not_null": lambda column, _: column.is_not_null(),
+}
+
+
+@dataclass(frozen=True)
+class Filter:
+    """
+    Attributes:
+        column (str): 컬럼
+        op (FilterOp): 연산자
+        value (Any): 비교 값. in/not_in 은 목록, between 은 (하한, 상한)
+    """
+
+    column: str
+    op: FilterOp = "eq"
+    value: Any = None
+
+    def to_expr(self) -> pl.Expr:
+        if self.op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported filter operator: {self.op}")
+        return _FILTER_OPS[self.op](pl.col(self.column), self.value)
+
+
+@dataclass(frozen=True)
+class Aggregation:
+    """
+    Attributes:
+        column (str): 컬럼
+        func (AggregationFunc): 집계 함수
+        alias (str): 결과 컬럼 이름. 없으면 {column}_{func}
+    """
+
+    column: str
+    func: AggregationFunc = "sum"
+    alias: str | None = None
+
+    def to_expr(self) -> pl.Expr:
+        if self.func == "count":
+            expr = pl.col(self.column).count()
+        else:
+            expr = getattr(pl.col(self.column), self.func)()
+        return expr.alias(self.alias or f"{self.column}_{self.func}")
+
+
+@dataclass(frozen=True)
+class Sort:
+    column: str
+    descending: bool = False
+
+
+@dataclass(frozen=True)
+class Query:
+    """
+    PolarsDataManager 에 대한 선언적 질의. filter -> group_by/aggregate -> select -> sort -> offset/limit 순서로 적용됩니다.
+
+    Attributes:
+        filters (tuple[Filter, ...]): AND 로 결합되는 조건
+        group_by (tuple[str, ...]): 그룹 컬럼
+        aggregations (tuple[Aggregation, ...]): 집계. group_by 가 없으면 전체를 집계합니다.
+        select (tuple[str, ...]): 반환할 컬럼. 비어 있으면 전체
+        sort (tuple[Sort, ...]): 정렬
+        offset (int): 건너뛸 row 수
+        limit (int): 반환할 최대 row 수
+    """
+
+    filters: tuple[Filter, ...] = ()
+    group_by: tuple[str, ...] = ()
+    aggregations: tuple[Aggregation, ...] = ()
+    select: tuple[str, ...] = ()
+    sort: tuple[Sort, ...] = ()
+    offset: int = 0
+    limit: int | None = None
+
+    def get_key(self) -> str:
+        """
+        조건의 순서와 무관하게 같은 질의는 같은 키를 가지도록 정규화합니다.
+        """
+        query = asdict(self)
+        query["filters"] = sorted(query["filters"], key=lambda f: json.dumps(f, sort_keys=True, default=str))
+        return json.dumps(query, sort_keys=True, default=str)
+
+    def compile(self, data: pl.LazyFrame) -> pl.LazyFrame:
+        if self.filters:
+            data = data.filter(*(f.to_expr() for f in self.filters))
+
+        if self.group_by:
+            data = data.group_by(*self.group_by).agg(*(a.to_expr() for a in self.aggregations))
+        elif self.aggregations:
+            data = data.select(*(a.to_expr() for a in self.aggregations))
+
+        if self.select:
+            data = data.select(*self.select)
+
+        if self.sort:
+            data = data.sort([s.column for s in self.sort], descending=[s.descending for s in self.sort])
+
+        if self.offset or self.limit is not None:
+            data = data.slice(self.offset, self.limit)
+
+        return data
+
+
+class LRUCache:
+    """
+    최근에 사용한 maxsize 개의 값을 유지하는 캐시
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        if key not in self._data:
+            return None
+
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+
+from redis.exceptions import LockError
+from webtool.cache import RedisCache
+
+from .data_manager import PolarsDataManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshJob:
+    """
+    Attributes:
+        name (str): 작업 이름. 프로세스 간 잠금 키로 사용됩니다.
+        manager (PolarsDataManager): 갱신할 데이터
+        interval (float): 갱신 주기 (초)
+        incremental (bool): 변경된 파티션만 다시 불러올지 여부
+        jitter (float): 여러 worker 의 갱신 시각이 겹치지 않도록 주기에 더하는 최대 비율
+    """
+
+    name: str
+    manager: PolarsDataManager
+    interval: float
+    incremental: bool = True
+    jitter: float = 0.1
+
+    def get_delay(self) -> float:
+        return self.interval * (1 + random.uniform(0, self.jitter))
+
+
+class RefreshScheduler:
+    """
+    PolarsDataManager 를 주기적으로 백그라운드에서 갱신하는 클래스
+    Redis 잠금을 얻은 한 worker 만 API 로부터 데이터를 다시 불러와 캐시에 저장하고,
+    나머지 worker 는 캐시의 버전이 바뀌었을 때만 캐시로부터 데이터를 불러옵니다.
+    """
+
+    def __init__(self, cache: RedisCache, lock_ttl_ms: int = 30 * 60 * 1000, key_prefix: str = "refresh:"):
+        """
+        Args:
+            cache (RedisCache):
+            lock_ttl_ms (int): 갱신 잠금 만료 (ms). 갱신에 걸리는 최대 시간보다 길어야 합니다.
+            key_prefix (str): 잠금 키 전치사
+        """
+        self.cache = cache
+        self.lock_ttl_ms = lock_ttl_ms
+        self.key_prefix = key_prefix
+        self.jobs: list[RefreshJob] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def add(
+        self,
+        manager: PolarsDataManager,
+        interval: float,
+        incremental: bool = True,
+        name: str | None = None,
+    ) -> RefreshJob:
+        """
+        Parameters:
+            manager: 갱신할 데이터
+            interval: 갱신 주기 (초)
+            incremental: 변경된 파티션만 다시 불러올지 여부
+            name: 작업 이름. 없으면 manager 의 API Endpoint
+
+        Returns:
+            등록된 작업
+        """
+        job = RefreshJob(name or manager.path, manager, interval, incremental)
+        self.jobs.append(job)
+        return job
+
+    async def start(self) -> None:
+        """
+        등록된 작업을 백그라운드에서 시작합니다. 최초 데이터를 불러오는 것도 백그라운드에서 하므로,
+        캐시가 비어 있어 API 로부터 전체를 내려받거나 실패하더라도 app 의 시작을 막지 않습니다.
+        """
+        self._tasks = [asyncio.create_task(self._run(job), name=f"refresh:{job.name}") for job in self.jobs]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def refresh(self, job: RefreshJob) -> bool:
+        """
+        잠금을 얻으면 데이터를 다시 불러오고, 얻지 못하면 다른 worker 가 저장한 캐시와 동기화합니다.
+
+        Returns:
+            API 로부터 데이터를 다시 불러왔는지 여부
+        """
+        # token 을 확인하고 해제하는 redis-py 잠금을 사용하여, TTL 을 넘긴 갱신이 다른 worker 의 잠금을 풀지 않게 합니다.
+        lock = self.cache.cache.lock(f"{self.key_prefix}{job.name}", timeout=self.lock_ttl_ms / 1000, blocking=False)
+        if not await lock.acquire():
+            await job.manager.sync()
+            return False
+
+        try:
+            await job.manager.init(reload=True, incremental=job.incremental)
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                logger.warning("refresh %s outlived its lock (%d ms)", job.name, self.lock_ttl_ms)
+        return True
+
+    async def _run(self, job: RefreshJob) -> None:
+        try:
+            await job.manager.init()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 최초 로드에 실패하면 다음 주기의 갱신에서 다시 불러옵니다.
+            logger.exception("initial load of %s failed", job.name)
+
+        while True:
+            await asyncio.sleep(job.get_delay())
+            try:
+                await self.refresh(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 갱신에 실패해도 이전 Snapshot 으로 계속 응답하며 다음 주기에 다시 시도합니다.
+                logger.exception("refresh %s failed", job.name)
@@ -0,0 +1,181 @@
+import json
+
+import polars as pl
+
+Schema = dict[str, pl.DataType]
+
+_SWAGGER_TYPES: dict[tuple[str, str | None], pl.DataType] = {
+    ("integer", None): pl.Int64,
+    ("integer", "int32"): pl.Int32,
+    ("integer", "int64"): pl.Int64,
+    ("number", None): pl.Float64,
+    ("number", "float"): pl.Float32,
+    ("number", "double"): pl.Float64,
+    ("boolean", None): pl.Boolean,
+    ("string", None): pl.Utf8,
+    ("string", "date"): pl.Date,
+    ("string", "date-time"): pl.Datetime,
+}
+
+# 페이지를 만들 때는 문자열로 받고, 모든 페이지를 합친 뒤 한 번에 변환하는 타입
+_DEFERRED_TYPES = (pl.Categorical, pl.Date, pl.Datetime)
+
+
+def schema_from_docs(path_docs: dict, parameters_key: str = "parameters", name_key: str = "name") -> Schema:
+    """
+    swagger 의 path 정의에서 타입이 선언된 파라미터와 응답 필드의 스키마를 만듭니다.
+
+    Parameters:
+        path_docs (dict): swagger paths 의 한 path 에 대한 정의
+        parameters_key (str): 파라미터 목록의 키
+        name_key (str): 파라미터 이름의 키
+
+    Returns:
+        컬럼 -> dtype. 타입을 알 수 없는 컬럼은 포함되지 않습니다.
+    """
+    schema: Schema = {}
+
+    for operation in path_docs.values():
+        if not isinstance(operation, dict):
+            continue
+
+        for parameter in operation.get(parameters_key, []):
+            dtype = _SWAGGER_TYPES.get((parameter.get("type"), parameter.get("format")))
+            if dtype is not None and parameter.get(name_key):
+                schema[parameter[name_key]] = dtype
+
+        for response in operation.get("responses", {}).values():
+            schema.update(_schema_from_properties(response.get("schema", {})))
+
+    return schema
+
+
+def _schema_from_properties(definition: dict) -> Schema:
+    """
+    응답 스키마를 따라 내려가며 row 의 필드로 보이는 (값 타입을 가진) property 를 모읍니다.
+    """
+    schema: Schema = {}
+
+    if "items" in definition:
+        schema.update(_schema_from_properties(definition["items"]))
+
+    for name, prop in definition.get("properties", {}).items():
+        if "properties" in prop or "items" in prop:
+            schema.update(_schema_from_properties(prop))
+            continue
+
+        dtype = _SWAGGER_TYPES.get((prop.get("type"), prop.get("format")))
+        if dtype is not None:
+            schema[name] = dtype
+
+    return schema
+
+
+def compact_schema(data: pl.DataFrame, hints: Schema | None = None, categorical_ratio: float = 0.5) -> Schema:
+    """
+    추론된 데이터로부터 메모리를 적게 쓰는 스키마를 만듭니다. 고유값 비율이 categorical_ratio 이하인 문자열은 Categorical 로 변환합니다.
+    정수는 좁히지 않습니다. 이후의 데이터는 저장된 스키마로 만들어지므로, 처음 값 범위로 좁히면 범위를 넘는 값이 null 이 됩니다.
+
+    Parameters:
+        data (pl.DataFrame): 타입을 추론하여 만든 데이터
+        hints (Schema): 추론보다 우선하는 dtype (예: swagger 로부터 만든 스키마)
+        categorical_ratio (float): Categorical 로 변환할 고유값 비율의 상한
+
+    Returns:
+        컬럼 -> dtype
+    """
+    hints = hints or {}
+    schema: Schema = {}
+
+    for name, dtype in data.schema.items():
+        column = data.get_column(name)
+
+        if name in hints:
+            schema[name] = hints[name]
+        elif dtype == pl.Null:
+            schema[name] = pl.Utf8
+        elif dtype == pl.Utf8 and column.len() and column.n_unique() <= column.len() * categorical_ratio:
+            schema[name] = pl.Categorical
+        else:
+            schema[name] = dtype
+
+    return schema
+
+
+def get_construct_schema(schema: Schema) -> Schema:
+    """
+    페이지 단위로 DataFrame 을 만들 때 사용하는 스키마. 합친 뒤에 변환하는 타입은 문자열로 받습니다.
+    """
+    return {name: pl.Utf8 if dtype in _DEFERRED_TYPES else dtype for name, dtype in schema.items()}
+
+
+def cast(data: pl.DataFrame, schema: Schema) -> pl.DataFrame:
+    """
+    data 의 컬럼을 schema 의 dtype 으로 변환합니다. schema 에 없는 컬럼과 값이 맞지 않아 변환할 수 없는 컬럼은 그대로 둡니다.
+    """
+    columns = {name: dtype for name, dtype in schema.items() if name in data.columns and data.schema[name] != dtype}
+    if not columns:
+        return data
+
+    try:
+        return data.cast(columns)
+    except pl.exceptions.PolarsError:
+        pass
+
+    for name, dtype in columns.items():
+        try:
+            data = data.with_columns(data.get_column(name).cast(dtype))
+        except pl.exceptions.PolarsError:
+            continue
+    return data
+
+
+def dumps_schema(schema: Schema) -> str:
+    """
+    dtype 의 파라미터 (Datetime 의 time_unit/time_zone, Decimal 의 precision/scale, List/Array/Struct 의 내부 타입 등) 를
+    포함하여 JSON 으로 저장합니다. 파라미터가 없는 dtype 은 이름만 저장합니다.
+    """
+    return json.dumps({name: _dump_dtype(dtype) for name, dtype in schema.items()})
+
+
+def loads_schema(value: str | bytes) -> Schema:
+    return {name: _load_dtype(dtype) for name, dtype in json.loads(value).items()}
+
+
+def _dump_dtype(dtype: pl.DataType) -> str | dict:
+    if isinstance(dtype, type):
+        return dtype.__name__
+
+    name = type(dtype).__name__
+    if isinstance(dtype, pl.Datetime):
+        return {"type": name, "time_unit": dtype.time_unit, "time_zone": dtype.time_zone}
+    if isinstance(dtype, pl.Duration):
+        return {"type": name, "time_unit": dtype.time_unit}
+    if isinstance(dtype, pl.Decimal):
+        return {"type": name, "precision": dtype.precision, "scale": dtype.scale}
+    if isinstance(dtype, pl.Array):
+        return {"type": name, "inner": _dump_dtype(dtype.inner), "shape": list(dtype.shape)}
+    if isinstance(dtype, pl.List):
+        return {"type": name, "inner": _dump_dtype(dtype.inner)}
+    if isinstance(dtype, pl.Struct):
+        return {"type": name, "fields": [[field.name, _dump_dtype(field.dtype)] for field in dtype.fields]}
+    if isinstance(dtype, pl.Enum):
+        return {"type": name, "categories": dtype.categories.to_list()}
+    return name
+
+
+def _load_dtype(value: str | dict) -> pl.DataType:
+    if isinstance(value, str):
+        dtype = getattr(pl, value, None)
+        if not (isinstance(dtype, type) and issubclass(dtype, pl.DataType)):
+            raise ValueError(f"Unsupported dtype: {value}")
+        return dtype
+
+    params = {key: param for key, param in value.items() if key != "type"}
+    if "inner" in params:
+        params["inner"] = _load_dtype(params["inner"])
+    if "shape" in params:
+        params["shape"] = tuple(params["shape"])
+    if "fields" in params:
+        params["fields"] = [pl.Field(name, _load_dtype(dtype)) for name, dtype in params["fields"]]
+    return _load_dtype(value["type"])(**params)
@@ -0,0 +1,33 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 호출을 하나로 합치는 클래스
+    첫 호출만 func 를 실행하고, 실행 중에 들어온 호출은 같은 결과(또는 예외)를 기다립니다.
+    먼저 호출한 쪽이 취소되어도 실행은 취소되지 않으므로 기다리는 다른 호출에 영향을 주지 않습니다.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Parameters:
+            key: 합칠 호출의 키
+            func: 실행할 함수
+
+        Returns:
+            func 의 결과
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls